@@ -12,6 +12,7 @@ import logging
 import os
 import re
 from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -35,7 +36,16 @@ from pydantic import BaseModel
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Course Generation Service - Oboe Style", version="2.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shutdown: close the RAG engine's shared Groq client
+    if _RAG_AVAILABLE:
+        await get_rag_engine().aclose()
+
+
+app = FastAPI(title="Course Generation Service - Oboe Style", version="2.0.0", lifespan=lifespan)
 
 # CORS
 ALLOWED_ORIGINS = [
@@ -341,8 +351,9 @@ async def rag_query(req: RAGQueryRequest, user_id: str = Depends(verify_request_
     engine = get_rag_engine()
     if engine.document_count == 0:
         return {"answer": "No documents ingested yet. Upload content first.", "sources": []}
-    answer = await engine.query(req.question, top_k=req.top_k)
+    # One search feeds both the LLM context and the returned sources
     results = await engine.search(req.question, top_k=req.top_k)
+    answer = await engine.query(req.question, top_k=req.top_k, results=results)
     return {
         "answer": answer,
         "sources": [{"text": r["document"][:200], "score": r["score"], "source": r["metadata"].get("source")} for r in results],
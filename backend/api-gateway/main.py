@@ -52,7 +52,7 @@ logger = logging.getLogger(__name__)
 from orchestrator.config import MODULES as ORCH_MODULES, load_config as orch_load_config
 from orchestrator.engine import DecisionEngine
 from orchestrator.models import SkillScores, UserState, Decision
-from orchestrator.state_manager import StateManager
+from orchestrator.state_manager import DecisionLogWriter, StateManager
 from orchestrator.circuit_breaker import CircuitBreakerRegistry
 from orchestrator.service_registry import ServiceRegistry
 from orchestrator.metrics import MetricsCollector as OrchMetrics
@@ -272,6 +272,7 @@ No preamble, no bullet points — just the 2 sentences."""
 # ══════════════════════════════════════════════════════════════════
 
 DB_URL = os.getenv("SUPABASE_DB_URL", "")
+DB_REPLICA_URL = os.getenv("SUPABASE_DB_REPLICA_URL", "")
 
 
 @asynccontextmanager
@@ -291,6 +292,18 @@ async def lifespan(app: FastAPI):
         logger.warning("⚠️  SUPABASE_DB_URL not set — evaluator/orchestrator will be degraded")
         app.state.pool = None
 
+    # 1b. Optional read replica for orchestrator state/history reads
+    app.state.replica_pool = None
+    if DB_REPLICA_URL and app.state.pool:
+        try:
+            app.state.replica_pool = await asyncpg.create_pool(
+                dsn=DB_REPLICA_URL, min_size=1, max_size=10,
+                command_timeout=30, statement_cache_size=0,
+            )
+            logger.info("✅ Gateway read replica pool created")
+        except Exception as e:
+            logger.error(f"❌ Read replica pool failed, reading from primary: {e}")
+
     # 2. Orchestrator v2 subsystems
     orch_config = orch_load_config()
     app.state.orch_engine = DecisionEngine(orch_config)
@@ -302,7 +315,21 @@ async def lifespan(app: FastAPI):
     app.state.orch_registry = ServiceRegistry(orch_config, app.state.orch_cb)
     await app.state.orch_registry.start_monitoring()
     app.state.orch_metrics = OrchMetrics(buffer_size=orch_config.metrics_buffer_size)
-    app.state.orch_state_mgr = StateManager(app.state.pool) if app.state.pool else None
+    app.state.orch_decision_writer = None
+    if app.state.pool and orch_config.decision_flush_interval_s > 0:
+        app.state.orch_decision_writer = DecisionLogWriter(
+            app.state.pool, flush_interval_s=orch_config.decision_flush_interval_s,
+        )
+        await app.state.orch_decision_writer.start()
+    app.state.orch_state_mgr = (
+        StateManager(
+            app.state.pool,
+            app.state.orch_decision_writer,
+            cache_ttl_s=orch_config.state_cache_ttl_s,
+            replica_pool=app.state.replica_pool,
+        )
+        if app.state.pool else None
+    )
     logger.info(
         "✅ Orchestrator v2 engine ready "
         f"(weighted multi-signal, {orch_config.cb_failure_threshold}-fail circuit breaker)"
@@ -312,6 +339,10 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     await app.state.orch_registry.stop_monitoring()
+    if app.state.orch_decision_writer:
+        await app.state.orch_decision_writer.stop()
+    if app.state.replica_pool:
+        await app.state.replica_pool.close()
     if getattr(app.state, "pool", None):
         await app.state.pool.close()
 
@@ -964,6 +995,11 @@ async def api_evaluate(req: EvaluationRequest):
     logger.info(f"Scores for {req.user_id}: {scores}")
     await _save_scores(pool, req.user_id, req.module, scores)
     await _update_user_state_agg(pool, req.user_id)
+    # The embedded orchestrator caches UserState; drop it so the /api/next
+    # that follows routes on the new scores.
+    state_mgr: Optional[StateManager] = getattr(app.state, "orch_state_mgr", None)
+    if state_mgr:
+        state_mgr.invalidate(req.user_id)
     return {"status": "ok", "scores": scores}
 
 
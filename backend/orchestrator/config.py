@@ -134,11 +134,24 @@ class EngineConfig:
     # Health check
     health_check_interval_s: int = 30     # Background health check frequency
     health_check_timeout_s: float = 5.0   # Per-service health check timeout
+    health_check_concurrency: int = 16    # Max in-flight probes on the shared client
 
     # Metrics
     metrics_buffer_size: int = 1000       # In-memory ring buffer size
     metrics_flush_interval_s: int = 60    # Flush to DB frequency
 
+    # State cache
+    # Per-user state snapshot TTL (0 = off), for StateManager and the
+    # legacy state.py cache. Writes from other processes (e.g. the
+    # standalone evaluator) can be this stale.
+    state_cache_ttl_s: float = 5.0
+
+    # Decision audit trail
+    decision_flush_interval_s: float = 0.2  # Batch write period (0 = write inline)
+
+    # User memory events
+    memory_flush_interval_s: float = 0.05   # Batch write period (0 = write inline)
+
 
 # ── Dimension Metadata ────────────────────────────────────────────
 
@@ -213,6 +226,10 @@ def load_config() -> EngineConfig:
         "ORCH_CB_FAILURE_THRESHOLD": ("cb_failure_threshold", int),
         "ORCH_CB_RECOVERY_TIMEOUT": ("cb_recovery_timeout_s", int),
         "ORCH_HEALTH_CHECK_INTERVAL": ("health_check_interval_s", int),
+        "ORCH_HEALTH_CHECK_CONCURRENCY": ("health_check_concurrency", int),
+        "ORCH_DECISION_FLUSH_INTERVAL": ("decision_flush_interval_s", float),
+        "ORCH_MEMORY_FLUSH_INTERVAL": ("memory_flush_interval_s", float),
+        "ORCH_STATE_CACHE_TTL": ("state_cache_ttl_s", float),
     }
     for env_key, (field_name, cast_fn) in env_map.items():
         val = os.getenv(env_key)
@@ -20,6 +20,7 @@ import httpx
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 
 import sys
@@ -30,7 +31,7 @@ backend_root = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_root))
 
 from state import fetch_user_state, update_next_module
-from rules import decide, get_module_description, get_weakness_trigger
+from rules import decide_with_trigger, get_module_description
 from shared.memory import UserMemory, create_user_memory
 
 # Load environment variables
@@ -201,6 +202,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger payloads (memory context, state dumps)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # ============ Routes ============
 
@@ -251,7 +255,7 @@ async def get_next_module(user_id: str = Query(..., description="User UUID")):
                 f"failure_awareness={state.get('failure_awareness_avg')}")
     
     # Step 2: Run deterministic rules
-    next_module, rule_reason = decide(state)
+    next_module, rule_reason, weakness_trigger = decide_with_trigger(state)
     logger.info(f"Decision for {user_id}: {next_module} ({rule_reason})")
     
     # Step 3: Build scores dict
@@ -262,7 +266,6 @@ async def get_next_module(user_id: str = Query(..., description="User UUID")):
         "failure_awareness_avg": state.get("failure_awareness_avg", 1.0),
         "dsa_predict_skill": state.get("dsa_predict_skill", 1.0),
     }
-    weakness_trigger = get_weakness_trigger(state)
     
     # Step 4: LLM reasoning (Decision 2)
     llm_reason = await generate_llm_reason(pool, user_id, next_module, rule_reason, scores)
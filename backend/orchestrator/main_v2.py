@@ -39,13 +39,16 @@ import os
 import time
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Type
 
 import asyncpg
 import httpx
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ValidationError
 
 # ── Package imports ───────────────────────────────────────────────
 import sys
@@ -62,14 +65,14 @@ from orchestrator.models import (
     UserStateResponse,
 )
 from orchestrator.engine import DecisionEngine
-from orchestrator.state_manager import StateManager
+from orchestrator.state_manager import DecisionLogWriter, StateManager
 from orchestrator.circuit_breaker import CircuitBreakerRegistry
 from orchestrator.service_registry import ServiceRegistry
 from orchestrator.metrics import MetricsCollector
 
 # Try to import memory (might not be available in all deployments)
 try:
-    from shared.memory import UserMemory, create_user_memory
+    from shared.memory import MemoryEventWriter, UserMemory, create_user_memory
     HAS_MEMORY = True
 except ImportError:
     HAS_MEMORY = False
@@ -85,6 +88,7 @@ logging.basicConfig(
 logger = logging.getLogger("orchestrator")
 
 DB_URL = os.getenv("SUPABASE_DB_URL", "")
+DB_REPLICA_URL = os.getenv("SUPABASE_DB_REPLICA_URL", "")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
@@ -121,6 +125,21 @@ async def lifespan(app: FastAPI):
         logger.warning("⚠️  SUPABASE_DB_URL not set — running in degraded mode")
         app.state.pool = None
 
+    # 1b. Optional read replica (state/history reads only)
+    app.state.replica_pool = None
+    if DB_REPLICA_URL and app.state.pool:
+        try:
+            app.state.replica_pool = await asyncpg.create_pool(
+                dsn=DB_REPLICA_URL,
+                min_size=1,
+                max_size=10,
+                command_timeout=30,
+                statement_cache_size=0,  # PgBouncer compatibility
+            )
+            logger.info("✅ Read replica pool created (1–10 connections)")
+        except Exception as e:
+            logger.error(f"❌ Read replica pool failed, reading from primary: {e}")
+
     # 2. Decision engine
     app.state.engine = DecisionEngine(config)
     logger.info("✅ Decision engine initialized (weighted multi-signal)")
@@ -147,18 +166,43 @@ async def lifespan(app: FastAPI):
     app.state.metrics = MetricsCollector(buffer_size=config.metrics_buffer_size)
     logger.info("✅ Metrics collector ready")
 
-    # 6. State manager
+    # 6. State manager (+ batched decision audit writes)
+    app.state.decision_writer = None
     if app.state.pool:
-        app.state.state_mgr = StateManager(app.state.pool)
+        if config.decision_flush_interval_s > 0:
+            app.state.decision_writer = DecisionLogWriter(
+                app.state.pool, flush_interval_s=config.decision_flush_interval_s,
+            )
+            await app.state.decision_writer.start()
+        app.state.state_mgr = StateManager(
+            app.state.pool,
+            app.state.decision_writer,
+            cache_ttl_s=config.state_cache_ttl_s,
+            replica_pool=app.state.replica_pool,
+        )
     else:
         app.state.state_mgr = None
 
+    # 7. Batched memory event writes
+    app.state.memory_writer = None
+    if HAS_MEMORY and app.state.pool and config.memory_flush_interval_s > 0:
+        app.state.memory_writer = MemoryEventWriter(
+            app.state.pool, flush_interval_s=config.memory_flush_interval_s,
+        )
+        await app.state.memory_writer.start()
+
     logger.info("🚀 Orchestrator v2.0 ready on port 8011")
 
     yield
 
     # Shutdown
     await app.state.registry.stop_monitoring()
+    if app.state.decision_writer:
+        await app.state.decision_writer.stop()
+    if app.state.memory_writer:
+        await app.state.memory_writer.stop()
+    if app.state.replica_pool:
+        await app.state.replica_pool.close()
     if app.state.pool:
         await app.state.pool.close()
     logger.info("Orchestrator shut down cleanly")
@@ -183,6 +227,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# /metrics and /services payloads grow with traffic; small /next bodies stay
+# below the threshold and are sent uncompressed.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+def _trusted_json(model: BaseModel) -> Response:
+    """
+    Serialize a response model built by this service without re-validating it.
+
+    The route keeps its response_model for OpenAPI docs, but returning a
+    Response directly skips FastAPI's validate + jsonable_encoder pass.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def _json_body(model: Type[BaseModel]):
+    """
+    Dependency that validates the raw request bytes straight into `model`.
+
+    model_validate_json parses and validates in one pass inside
+    pydantic-core, instead of FastAPI's json.loads → dict → validate.
+    Errors are re-raised as the usual 422 with body-prefixed locations.
+    """
+    async def parse(request: Request) -> BaseModel:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+            )
+    return parse
+
+
+def _json_body_doc(model: Type[BaseModel]) -> Dict[str, Any]:
+    """openapi_extra documenting a body parsed by _json_body()."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
 
 # ══════════════════════════════════════════════════════════════════
 #  LLM Reasoning (Decision 2 pattern: rules pick WHAT, LLM explains WHY)
@@ -389,7 +475,7 @@ async def get_next_module(user_id: str = Query(..., description="User UUID")):
             f"latency={elapsed:.0f}ms)"
         )
 
-        return NextModuleResponse(
+        return _trusted_json(NextModuleResponse.model_construct(
             next_module=decision.next_module,
             reason=decision.reason,
             description=decision.description,
@@ -399,7 +485,7 @@ async def get_next_module(user_id: str = Query(..., description="User UUID")):
             confidence=decision.confidence,
             depth=decision.depth.value,
             decision_id=decision.decision_id,
-        )
+        ))
 
     except Exception as e:
         logger.error(f"Decision pipeline failed for {user_id}: {e}", exc_info=True)
@@ -428,7 +514,7 @@ async def get_state(user_id: str):
     state = await state_mgr.get_user_state(user_id)
     depth = app.state.engine._determine_depth(state)
 
-    return UserStateResponse(
+    return _trusted_json(UserStateResponse.model_construct(
         user_id=user_id,
         clarity_avg=state.scores.clarity_avg,
         tradeoff_avg=state.scores.tradeoff_avg,
@@ -439,7 +525,7 @@ async def get_state(user_id: str):
         target_role=state.target_role,
         recent_modules=state.recent_modules[:5],
         depth=depth.value,
-    )
+    ))
 
 
 @app.get("/decisions/{user_id}")
@@ -457,13 +543,16 @@ async def get_decisions(user_id: str, limit: int = 10):
 #  ROUTES — Memory (User learning memory)
 # ══════════════════════════════════════════════════════════════════
 
-@app.post("/memory/{user_id}/record")
-async def record_memory_event(user_id: str, event: MemoryEventRequest):
+@app.post("/memory/{user_id}/record", openapi_extra=_json_body_doc(MemoryEventRequest))
+async def record_memory_event(
+    user_id: str,
+    event: MemoryEventRequest = Depends(_json_body(MemoryEventRequest)),
+):
     """Record a memory event (after interview, course, etc.)."""
     if not HAS_MEMORY or not app.state.pool:
         raise HTTPException(503, "Memory system not available")
 
-    memory = create_user_memory(user_id, app.state.pool)
+    memory = create_user_memory(user_id, app.state.pool, app.state.memory_writer)
     event_id = await memory.record_event(
         event_type=event.event_type,
         module=event.module,
@@ -515,8 +604,8 @@ async def trigger_pattern_update(user_id: str):
 #  ROUTES — Feedback Loop
 # ══════════════════════════════════════════════════════════════════
 
-@app.post("/feedback")
-async def record_feedback(event: FeedbackEvent):
+@app.post("/feedback", openapi_extra=_json_body_doc(FeedbackEvent))
+async def record_feedback(event: FeedbackEvent = Depends(_json_body(FeedbackEvent))):
     """
     Record feedback from a completed module session.
     Closes the learning loop: user does module → evaluator scores → feedback → re-route.
@@ -527,7 +616,9 @@ async def record_feedback(event: FeedbackEvent):
     # Record to memory if available
     if HAS_MEMORY and app.state.pool:
         try:
-            memory = create_user_memory(event.user_id, app.state.pool)
+            memory = create_user_memory(
+                event.user_id, app.state.pool, app.state.memory_writer
+            )
             await memory.record_event(
                 event_type="session_feedback",
                 module=event.module,
@@ -12,6 +12,7 @@ Design Pattern: Observer + Ring Buffer
 
 import asyncio
 import logging
+import os
 import time
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
@@ -31,25 +32,29 @@ class MetricPoint:
 
 
 class Counter:
-    """Monotonically increasing counter."""
+    """
+    Monotonically increasing counter.
+
+    Only the per-label cells are written on inc(); the total is merged on
+    read, so the hot path is a single dict update.
+    """
     def __init__(self, name: str):
         self.name = name
-        self._value: int = 0
         self._per_label: Dict[str, int] = defaultdict(int)
 
     def inc(self, label: str = "__total__", amount: int = 1):
-        self._value += amount
         self._per_label[label] += amount
 
     @property
     def value(self) -> int:
-        return self._value
+        return sum(self._per_label.values())
 
     def by_label(self) -> Dict[str, int]:
         return dict(self._per_label)
 
     def to_dict(self) -> dict:
-        return {"name": self.name, "total": self._value, "by_label": self.by_label()}
+        by_label = self.by_label()
+        return {"name": self.name, "total": sum(by_label.values()), "by_label": by_label}
 
 
 class Histogram:
@@ -119,6 +124,9 @@ class MetricsCollector:
 
     def __init__(self, buffer_size: int = 1000):
         self._start_time = time.monotonic()
+        # Each Uvicorn worker owns its collector; tag output so scrapes
+        # across workers can be summed per pid.
+        self._pid = os.getpid()
 
         # Counters
         self.decisions_total = Counter("decisions_total")
@@ -191,6 +199,7 @@ class MetricsCollector:
     def summary(self) -> Dict[str, Any]:
         """Full metrics summary for /metrics endpoint."""
         return {
+            "worker_pid": self._pid,
             "uptime_seconds": round(self.uptime_seconds, 1),
             "active_users": self.active_user_count,
             "decisions": self.decisions_total.to_dict(),
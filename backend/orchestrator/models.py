@@ -5,11 +5,13 @@ Pydantic models for API contracts, internal state, and events.
 Single source of truth — imported by gateway and standalone service.
 """
 
+from __future__ import annotations
+
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ── Enums ─────────────────────────────────────────────────────────
@@ -21,6 +23,19 @@ class DecisionDepth(str, Enum):
     CRITICAL = "critical"       # One skill below critical threshold
     ONBOARDING = "onboarding"   # Fresh user, no history
 
+    @property
+    def as_int(self) -> int:
+        """Integer code stored in orchestrator_decisions.depth."""
+        return _DEPTH_INT[self]
+
+
+_DEPTH_INT = {
+    DecisionDepth.NORMAL: 1,
+    DecisionDepth.REMEDIATION: 2,
+    DecisionDepth.CRITICAL: 3,
+    DecisionDepth.ONBOARDING: 0,
+}
+
 
 class CircuitState(str, Enum):
     """Circuit breaker states."""
@@ -39,8 +54,21 @@ class ServiceStatus(str, Enum):
 
 # ── Skill Scores ──────────────────────────────────────────────────
 
+# Field order of SkillScores (also the tie-break order for weakest_dimension)
+SCORE_FIELDS = (
+    "clarity_avg",
+    "tradeoff_avg",
+    "adaptability_avg",
+    "failure_awareness_avg",
+    "dsa_predict_skill",
+)
+
+
 class SkillScores(BaseModel):
     """Current skill scores for a user across all dimensions."""
+    # Immutable + hashable: instances can be shared and used as cache keys
+    model_config = ConfigDict(frozen=True)
+
     clarity_avg: float = Field(1.0, ge=0.0, le=1.0)
     tradeoff_avg: float = Field(1.0, ge=0.0, le=1.0)
     adaptability_avg: float = Field(1.0, ge=0.0, le=1.0)
@@ -48,18 +76,23 @@ class SkillScores(BaseModel):
     dsa_predict_skill: float = Field(1.0, ge=0.0, le=1.0)
 
     def to_dict(self) -> Dict[str, float]:
-        return self.model_dump()
+        # Plain attribute reads — avoids building a model_dump() serializer
+        return {k: getattr(self, k) for k in SCORE_FIELDS}
 
     def weakest_dimension(self, threshold: float = 0.4) -> Optional[str]:
         """Return the weakest skill below threshold, or None."""
-        scores = self.to_dict()
-        below = {k: v for k, v in scores.items() if v < threshold}
-        if not below:
-            return None
-        return min(below, key=below.get)
+        worst_key, worst_val = None, threshold
+        for k in SCORE_FIELDS:
+            v = getattr(self, k)
+            if v < worst_val:
+                worst_key, worst_val = k, v
+        return worst_key
 
     def all_healthy(self, threshold: float = 0.4) -> bool:
-        return all(v >= threshold for v in self.to_dict().values())
+        for k in SCORE_FIELDS:
+            if getattr(self, k) < threshold:
+                return False
+        return True
 
 
 # ── User State ────────────────────────────────────────────────────
@@ -9,6 +9,7 @@ Module names MUST match frontend OrchestratorCard MODULE_CONFIG:
   resume_builder, project_studio, onboarding
 """
 
+import sys
 from typing import Dict, Optional, Tuple
 
 # Threshold for triggering remediation
@@ -25,6 +26,60 @@ MODULES: Dict[str, str] = {
 }
 
 
+# Rule table (priority order). Index i pairs a score key with the module
+# that remediates it and the reason template shown to the user.
+_KEYS: Tuple[str, ...] = (
+    "clarity_avg",
+    "tradeoff_avg",
+    "adaptability_avg",
+    "failure_awareness_avg",
+    "dsa_predict_skill",
+)
+_MODULES: Tuple[str, ...] = (
+    "production_interview",
+    "interactive_course",
+    "production_interview",
+    "interactive_course",
+    "dsa_practice",
+)
+# The threshold is baked in at import, leaving only the score slot
+# ("{:.2f}") to fill per call.
+_REASONS: Tuple[str, ...] = tuple(
+    tmpl.format("{:.2f}", WEAKNESS_THRESHOLD)
+    for tmpl in (
+        "Clarity score ({}) is below {}. "
+        "Practice explaining your thinking clearly in mock interviews.",
+        "Tradeoff awareness ({}) is below {}. "
+        "Study system design concepts and tradeoff analysis through interactive courses.",
+        "Adaptability score ({}) is below {}. "
+        "Practice curveball scenarios in mock interviews to improve flexibility.",
+        "Failure awareness ({}) is below {}. "
+        "Learn about edge cases and failure modes through interactive courses.",
+        "DSA skill ({}) is below {}. "
+        "Practice algorithms and use the AI chatbot for hints.",
+    )
+)
+_HEALTHY_REASON = sys.intern(
+    "All metrics are healthy (≥ 0.4). Apply your skills to a real project!"
+)
+
+
+def _first_weakness(state: dict) -> Tuple[int, float]:
+    """
+    Scan scores in rule priority order.
+
+    Returns (index, value) of the first score below WEAKNESS_THRESHOLD,
+    or (-1, 1.0) when all scores are healthy. Missing/falsy values count
+    as 1.0 (healthy).
+    """
+    get = state.get
+    for i, key in enumerate(_KEYS):
+        val = get(key, 1.0) or 1.0
+        if val < WEAKNESS_THRESHOLD:
+            return i, val
+    return -1, 1.0
+
+
 def decide(state: dict) -> Tuple[str, str]:
     """
     Deterministic routing logic based on weakness scores.
@@ -44,59 +99,23 @@ def decide(state: dict) -> Tuple[str, str]:
     5. Low DSA             → dsa_practice          (algorithm practice)
     6. All healthy         → project_studio        (apply knowledge)
     """
+    next_module, reason, _ = decide_with_trigger(state)
+    return next_module, reason
+
 
-    # Extract values with defaults (1.0 = healthy)
-    clarity = state.get("clarity_avg", 1.0) or 1.0
-    tradeoffs = state.get("tradeoff_avg", 1.0) or 1.0
-    adaptability = state.get("adaptability_avg", 1.0) or 1.0
-    failure_awareness = state.get("failure_awareness_avg", 1.0) or 1.0
-    dsa_predict = state.get("dsa_predict_skill", 1.0) or 1.0
-
-    # Rule 1: Clarity issues → production_interview
-    if clarity < WEAKNESS_THRESHOLD:
-        return (
-            "production_interview",
-            f"Clarity score ({clarity:.2f}) is below {WEAKNESS_THRESHOLD}. "
-            "Practice explaining your thinking clearly in mock interviews.",
-        )
-
-    # Rule 2: Tradeoff issues → interactive_course
-    if tradeoffs < WEAKNESS_THRESHOLD:
-        return (
-            "interactive_course",
-            f"Tradeoff awareness ({tradeoffs:.2f}) is below {WEAKNESS_THRESHOLD}. "
-            "Study system design concepts and tradeoff analysis through interactive courses.",
-        )
-
-    # Rule 3: Adaptability issues → production_interview
-    if adaptability < WEAKNESS_THRESHOLD:
-        return (
-            "production_interview",
-            f"Adaptability score ({adaptability:.2f}) is below {WEAKNESS_THRESHOLD}. "
-            "Practice curveball scenarios in mock interviews to improve flexibility.",
-        )
-
-    # Rule 4: Failure awareness → interactive_course
-    if failure_awareness < WEAKNESS_THRESHOLD:
-        return (
-            "interactive_course",
-            f"Failure awareness ({failure_awareness:.2f}) is below {WEAKNESS_THRESHOLD}. "
-            "Learn about edge cases and failure modes through interactive courses.",
-        )
-
-    # Rule 5: DSA prediction → dsa_practice
-    if dsa_predict < WEAKNESS_THRESHOLD:
-        return (
-            "dsa_practice",
-            f"DSA skill ({dsa_predict:.2f}) is below {WEAKNESS_THRESHOLD}. "
-            "Practice algorithms and use the AI chatbot for hints.",
-        )
+def decide_with_trigger(state: dict) -> Tuple[str, str, Optional[str]]:
+    """
+    decide() and get_weakness_trigger() from a single scan of the scores.
+
+    Returns:
+        Tuple of (next_module, reason, weakness_trigger)
+    """
+    idx, val = _first_weakness(state)
+    if idx >= 0:
+        return _MODULES[idx], _REASONS[idx].format(val), _KEYS[idx]
 
     # Rule 6: All healthy → project_studio
-    return (
-        "project_studio",
-        "All metrics are healthy (≥ 0.4). Apply your skills to a real project!",
-    )
+    return "project_studio", _HEALTHY_REASON, None
 
 
 def get_module_description(module: str) -> str:
@@ -106,20 +125,5 @@ def get_module_description(module: str) -> str:
 
 def get_weakness_trigger(state: dict) -> Optional[str]:
     """Return the metric name that triggered routing, or None if all healthy."""
-    clarity = state.get("clarity_avg", 1.0) or 1.0
-    tradeoffs = state.get("tradeoff_avg", 1.0) or 1.0
-    adaptability = state.get("adaptability_avg", 1.0) or 1.0
-    failure_awareness = state.get("failure_awareness_avg", 1.0) or 1.0
-    dsa_predict = state.get("dsa_predict_skill", 1.0) or 1.0
-
-    if clarity < WEAKNESS_THRESHOLD:
-        return "clarity_avg"
-    if tradeoffs < WEAKNESS_THRESHOLD:
-        return "tradeoff_avg"
-    if adaptability < WEAKNESS_THRESHOLD:
-        return "adaptability_avg"
-    if failure_awareness < WEAKNESS_THRESHOLD:
-        return "failure_awareness_avg"
-    if dsa_predict < WEAKNESS_THRESHOLD:
-        return "dsa_predict_skill"
-    return None
+    idx, _ = _first_weakness(state)
+    return _KEYS[idx] if idx >= 0 else None
@@ -16,13 +16,13 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
-from .circuit_breaker import CircuitBreakerRegistry, CBState
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CBState
 from .config import MODULES, EngineConfig
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceHealth:
     """Health snapshot for a single service."""
     name: str
@@ -36,6 +36,17 @@ class ServiceHealth:
     consecutive_failures: int = 0
     uptime_checks: int = 0
     healthy_checks: int = 0
+    # to_dict() template; identity fields never change after registration
+    _static: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._static = {
+            "name": self.name,
+            "status": None,
+            "is_embedded": self.is_embedded,
+            "url": self.url,
+            "port": self.port,
+        }
 
     @property
     def availability_pct(self) -> float:
@@ -44,17 +55,13 @@ class ServiceHealth:
         return round((self.healthy_checks / self.uptime_checks) * 100, 1)
 
     def to_dict(self) -> dict:
-        return {
-            "name": self.name,
-            "status": self.status,
-            "is_embedded": self.is_embedded,
-            "url": self.url,
-            "port": self.port,
-            "latency_ms": self.last_response_time_ms,
-            "availability_pct": self.availability_pct,
-            "consecutive_failures": self.consecutive_failures,
-            "last_error": self.last_error,
-        }
+        d = self._static.copy()
+        d["status"] = self.status
+        d["latency_ms"] = self.last_response_time_ms
+        d["availability_pct"] = self.availability_pct
+        d["consecutive_failures"] = self.consecutive_failures
+        d["last_error"] = self.last_error
+        return d
 
 
 class ServiceRegistry:
@@ -78,6 +85,11 @@ class ServiceRegistry:
         self._services: Dict[str, ServiceHealth] = {}
         self._monitor_task: Optional[asyncio.Task] = None
         self._running = False
+        self._http: Optional[httpx.AsyncClient] = None  # shared keep-alive client
+        self._probe_slots = asyncio.Semaphore(max(1, config.health_check_concurrency))
+        # all_status() snapshot; dropped when probe data or registrations change
+        self._status_snapshot: Optional[Dict[str, dict]] = None
+        self._snapshot_cb_states: List[CBState] = []
 
         # Register all known services from config
         self._register_module_services()
@@ -108,6 +120,7 @@ class ServiceRegistry:
         self._services[name] = ServiceHealth(
             name=name, url=url, port=port, is_embedded=False,
         )
+        self._status_snapshot = None
         logger.info(f"📋 Registered service: {name} → {url}")
 
     def get(self, name: str) -> Optional[ServiceHealth]:
@@ -126,13 +139,33 @@ class ServiceRegistry:
 
     def get_healthy_services(self) -> List[str]:
         """Return names of all healthy services."""
+        breakers = self.circuit_breakers
         return [
             name for name, svc in self._services.items()
-            if svc.is_embedded or self.is_healthy(name)
+            if svc.is_embedded or breakers.get(name).state != CBState.OPEN
         ]
 
     def all_status(self) -> Dict[str, dict]:
-        """Full status dashboard."""
+        """
+        Full status dashboard.
+
+        Served from a snapshot rebuilt once per health-check tick. Breakers
+        can also change state between ticks (request failures, recovery
+        timeout, manual reset), so their states are compared on each call
+        and the snapshot is rebuilt if any moved. Treat the result as
+        read-only.
+        """
+        breakers = self.circuit_breakers
+        cb_states = [
+            breakers.get(name).state
+            for name, svc in self._services.items() if not svc.is_embedded
+        ]
+        if self._status_snapshot is None or cb_states != self._snapshot_cb_states:
+            self._status_snapshot = self._build_status()
+            self._snapshot_cb_states = cb_states
+        return self._status_snapshot
+
+    def _build_status(self) -> Dict[str, dict]:
         result = {}
         for name, svc in self._services.items():
             status = svc.to_dict()
@@ -149,6 +182,12 @@ class ServiceRegistry:
         if self._running:
             return
         self._running = True
+        # One pooled client for all probes — reuses TCP connections across
+        # intervals instead of a fresh handshake per service per check.
+        self._http = httpx.AsyncClient(
+            timeout=self.config.health_check_timeout_s,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
         self._monitor_task = asyncio.create_task(self._health_check_loop())
         logger.info(
             f"🏥 Health monitor started (interval={self.config.health_check_interval_s}s)"
@@ -164,6 +203,9 @@ class ServiceRegistry:
             except asyncio.CancelledError:
                 pass
             self._monitor_task = None
+        if self._http:
+            await self._http.aclose()
+            self._http = None
         logger.info("🏥 Health monitor stopped")
 
     async def _health_check_loop(self):
@@ -171,6 +213,7 @@ class ServiceRegistry:
         while self._running:
             try:
                 await self._check_all_services()
+                self._status_snapshot = None
                 await asyncio.sleep(self.config.health_check_interval_s)
             except asyncio.CancelledError:
                 break
@@ -179,14 +222,15 @@ class ServiceRegistry:
                 await asyncio.sleep(5)
 
     async def _check_all_services(self):
-        """Check all non-embedded services concurrently."""
-        tasks = []
-        for name, svc in self._services.items():
-            if not svc.is_embedded and svc.url:
-                tasks.append(self._check_service(name, svc))
-
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        """Check all non-embedded services concurrently over the shared client."""
+        await asyncio.gather(
+            *(
+                self._check_service(name, svc)
+                for name, svc in self._services.items()
+                if not svc.is_embedded and svc.url
+            ),
+            return_exceptions=True,
+        )
 
     async def _check_service(self, name: str, svc: ServiceHealth):
         """Check a single service's health endpoint."""
@@ -195,40 +239,35 @@ class ServiceRegistry:
 
         start = time.monotonic()
         try:
-            async with httpx.AsyncClient(
-                timeout=self.config.health_check_timeout_s
-            ) as client:
-                resp = await client.get(url)
-                elapsed_ms = (time.monotonic() - start) * 1000
-
-                svc.uptime_checks += 1
-                svc.last_check_time = time.monotonic()
-                svc.last_response_time_ms = round(elapsed_ms, 1)
-
-                if resp.status_code == 200:
-                    svc.status = "healthy"
-                    svc.consecutive_failures = 0
-                    svc.healthy_checks += 1
-                    svc.last_error = None
-                    cb.record_success()
-                else:
-                    svc.status = "degraded"
-                    svc.consecutive_failures += 1
-                    svc.last_error = f"HTTP {resp.status_code}"
-                    cb.record_failure()
+            async with self._probe_slots:
+                resp = await self._http.get(url)
+            latency_ms = round((time.monotonic() - start) * 1000, 1)
+            if resp.status_code == 200:
+                self._record(svc, cb, "healthy", latency_ms, None)
+            else:
+                self._record(svc, cb, "degraded", latency_ms, f"HTTP {resp.status_code}")
 
         except httpx.TimeoutException:
-            svc.uptime_checks += 1
-            svc.status = "unhealthy"
-            svc.consecutive_failures += 1
-            svc.last_error = "Timeout"
-            svc.last_response_time_ms = None
-            cb.record_failure()
+            self._record(svc, cb, "unhealthy", None, "Timeout")
 
         except Exception as e:
-            svc.uptime_checks += 1
-            svc.status = "unhealthy"
-            svc.consecutive_failures += 1
-            svc.last_error = str(e)[:100]
-            svc.last_response_time_ms = None
-            cb.record_failure()
+            self._record(svc, cb, "unhealthy", None, str(e)[:100])
+
+    @staticmethod
+    def _record(
+        svc: ServiceHealth,
+        cb: CircuitBreaker,
+        status: str,
+        latency_ms: Optional[float],
+        error: Optional[str],
+    ):
+        """Apply one probe outcome to the service snapshot and its breaker."""
+        ok = status == "healthy"
+        svc.uptime_checks += 1
+        svc.healthy_checks += ok
+        svc.consecutive_failures = 0 if ok else svc.consecutive_failures + 1
+        svc.last_check_time = time.monotonic()
+        svc.last_response_time_ms = latency_ms
+        svc.status = status
+        svc.last_error = error
+        (cb.record_success if ok else cb.record_failure)()
@@ -4,11 +4,18 @@ Handles fetching and updating user_state from database.
 Auto-initializes state for new users.
 """
 
+import asyncio
 import logging
-from typing import Optional
+import sys
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 import asyncpg
 
+from config import load_config
+
 logger = logging.getLogger(__name__)
 
 # Default values for new users (all metrics start at 1.0 = healthy)
@@ -21,40 +28,128 @@ DEFAULT_STATE = {
     "next_module": None
 }
 
+# Steady-state read: no INSERT attempt, so no insert/lock work for existing
+# users. Only on a miss do we fall back to _FETCH_OR_INIT_SQL below.
+_READ_STATE_SQL = """
+    SELECT
+        user_id,
+        COALESCE(clarity_avg, 1.0) as clarity_avg,
+        COALESCE(tradeoff_avg, 1.0) as tradeoff_avg,
+        COALESCE(adaptability_avg, 1.0) as adaptability_avg,
+        COALESCE(failure_awareness_avg, 1.0) as failure_awareness_avg,
+        COALESCE(dsa_predict_skill, 1.0) as dsa_predict_skill,
+        next_module,
+        last_update
+    FROM public.user_state
+    WHERE user_id = $1
+"""
+
+# Insert-if-missing and read in a single round trip. A freshly inserted row
+# is not visible to the outer SELECT (same snapshot), so it is taken from
+# the CTE's RETURNING instead; existing rows come from the table.
+_FETCH_OR_INIT_SQL = """
+    WITH ins AS (
+        INSERT INTO public.user_state (user_id)
+        VALUES ($1)
+        ON CONFLICT (user_id) DO NOTHING
+        RETURNING user_id, clarity_avg, tradeoff_avg, adaptability_avg,
+                  failure_awareness_avg, dsa_predict_skill, next_module, last_update
+    ), cur AS (
+        SELECT user_id, clarity_avg, tradeoff_avg, adaptability_avg,
+               failure_awareness_avg, dsa_predict_skill, next_module, last_update
+        FROM ins
+        UNION ALL
+        SELECT user_id, clarity_avg, tradeoff_avg, adaptability_avg,
+               failure_awareness_avg, dsa_predict_skill, next_module, last_update
+        FROM public.user_state
+        WHERE user_id = $1
+    )
+    SELECT
+        user_id,
+        COALESCE(clarity_avg, 1.0) as clarity_avg,
+        COALESCE(tradeoff_avg, 1.0) as tradeoff_avg,
+        COALESCE(adaptability_avg, 1.0) as adaptability_avg,
+        COALESCE(failure_awareness_avg, 1.0) as failure_awareness_avg,
+        COALESCE(dsa_predict_skill, 1.0) as dsa_predict_skill,
+        next_module,
+        last_update
+    FROM cur
+    LIMIT 1
+"""
+
+# Column order of both queries above. Interned so the dicts we hand to
+# rules.decide() share key objects with its literal lookups (identity hit
+# instead of a string compare); asyncpg builds fresh key strings per query.
+_STATE_COLUMNS = tuple(map(sys.intern, (
+    "user_id",
+    "clarity_avg",
+    "tradeoff_avg",
+    "adaptability_avg",
+    "failure_awareness_avg",
+    "dsa_predict_skill",
+    "next_module",
+    "last_update",
+)))
+
+_UPDATE_NEXT_MODULE_SQL = """
+    UPDATE public.user_state
+    SET next_module = $2, last_update = NOW()
+    WHERE user_id = $1
+    RETURNING last_update
+"""
+
+# In-process read cache. update_next_module() patches the cached entry, so
+# the fetch → decide → update cycle of /next keeps it warm. Scores are
+# written by the evaluator service in another process, which this cache
+# never hears about: they show up here within one TTL
+# (ORCH_STATE_CACHE_TTL in config.py; 0 disables the cache).
+STATE_CACHE_MAX_ENTRIES = 10_000
+
+# user_id -> (expires_at, state), kept in LRU order
+_STATE_CACHE: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+# user_id -> DB load in progress, shared by concurrent callers (single-flight)
+_INFLIGHT: Dict[str, "asyncio.Task[dict]"] = {}
+
 
 async def fetch_user_state(pool: asyncpg.Pool, user_id: str) -> dict:
     """
-    Fetch user_state from database.
+    Fetch user_state, from the in-process cache when fresh.
     Auto-initializes if row doesn't exist (Option A behavior).
     
+    Concurrent misses for the same user share one DB query.
     Returns dict with all state fields.
     """
+    cached = _STATE_CACHE.get(user_id)
+    if cached is not None:
+        if cached[0] > time.monotonic():
+            _STATE_CACHE.move_to_end(user_id)
+            return dict(cached[1])
+        del _STATE_CACHE[user_id]
+
+    task = _INFLIGHT.get(user_id)
+    if task is None:
+        task = asyncio.ensure_future(_load_user_state(pool, user_id))
+        _INFLIGHT[user_id] = task
+        task.add_done_callback(lambda t: _inflight_done(user_id, t))
+    # shield: one caller being cancelled must not cancel the shared load
+    return dict(await asyncio.shield(task))
+
+
+async def _load_user_state(pool: asyncpg.Pool, user_id: str) -> dict:
+    """Read (or initialize) the row and cache it on success."""
     try:
         async with pool.acquire() as conn:
-            # First, ensure row exists (upsert with defaults)
-            await conn.execute("""
-                INSERT INTO public.user_state (user_id)
-                VALUES ($1)
-                ON CONFLICT (user_id) DO NOTHING
-            """, user_id)
-            
-            # Then fetch
-            row = await conn.fetchrow("""
-                SELECT 
-                    user_id,
-                    COALESCE(clarity_avg, 1.0) as clarity_avg,
-                    COALESCE(tradeoff_avg, 1.0) as tradeoff_avg,
-                    COALESCE(adaptability_avg, 1.0) as adaptability_avg,
-                    COALESCE(failure_awareness_avg, 1.0) as failure_awareness_avg,
-                    COALESCE(dsa_predict_skill, 1.0) as dsa_predict_skill,
-                    next_module,
-                    last_update
-                FROM public.user_state
-                WHERE user_id = $1
-            """, user_id)
+            row = await conn.fetchrow(_READ_STATE_SQL, user_id)
+            if row is None:
+                # First visit: insert (race-safe) and read back
+                row = await conn.fetchrow(_FETCH_OR_INIT_SQL, user_id)
             
             if row:
-                return dict(row)
+                state = dict(zip(_STATE_COLUMNS, row))
+                # Skip caching if update_next_module() invalidated mid-flight
+                if _INFLIGHT.get(user_id) is asyncio.current_task():
+                    _cache_put(user_id, state)
+                return state
             
             # Fallback (should never reach here due to upsert)
             logger.warning(f"User {user_id} state not found after upsert, using defaults")
@@ -66,19 +161,56 @@ async def fetch_user_state(pool: asyncpg.Pool, user_id: str) -> dict:
         return {**DEFAULT_STATE, "user_id": user_id}
 
 
+def _inflight_done(user_id: str, task: "asyncio.Task[dict]") -> None:
+    if _INFLIGHT.get(user_id) is task:
+        del _INFLIGHT[user_id]
+
+
+@lru_cache(maxsize=1)
+def _cache_ttl_s() -> float:
+    # Read on first use rather than at import, after main.py loads .env
+    return load_config().state_cache_ttl_s
+
+
+def _cache_put(user_id: str, state: dict) -> None:
+    ttl = _cache_ttl_s()
+    if ttl <= 0:
+        return
+    _STATE_CACHE[user_id] = (time.monotonic() + ttl, state)
+    _STATE_CACHE.move_to_end(user_id)
+    while len(_STATE_CACHE) > STATE_CACHE_MAX_ENTRIES:
+        _STATE_CACHE.popitem(last=False)
+
+
+def invalidate_user_state(user_id: str) -> None:
+    """Drop any cached or in-flight state for a user."""
+    _STATE_CACHE.pop(user_id, None)
+    _INFLIGHT.pop(user_id, None)
+
+
 async def update_next_module(pool: asyncpg.Pool, user_id: str, next_module: str) -> bool:
     """
     Update the next_module field in user_state.
     
+    A cached snapshot is updated in place (keeping its expiry) rather
+    than dropped, so the next /next call is still served from memory.
     Returns True if successful.
     """
     try:
         async with pool.acquire() as conn:
-            await conn.execute("""
-                UPDATE public.user_state
-                SET next_module = $2, last_update = NOW()
-                WHERE user_id = $1
-            """, user_id, next_module)
+            last_update = await conn.fetchval(_UPDATE_NEXT_MODULE_SQL, user_id, next_module)
+            # A load already in flight may have read the old row
+            _INFLIGHT.pop(user_id, None)
+            cached = _STATE_CACHE.get(user_id)
+            if cached is not None:
+                if last_update is None:
+                    del _STATE_CACHE[user_id]
+                else:
+                    _STATE_CACHE[user_id] = (cached[0], {
+                        **cached[1],
+                        "next_module": next_module,
+                        "last_update": last_update,
+                    })
             logger.info(f"Updated next_module for {user_id}: {next_module}")
             return True
             
@@ -11,13 +11,23 @@ Enhanced state management with:
 Replaces the old state.py with richer state assembly.
 """
 
+import asyncio
 import json
 import logging
 import time
-from typing import Any, Dict, List, Optional
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import asyncpg
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from shared.batch_writer import BatchWriter
+
 from .models import Decision, SkillScores, UserState
 
 logger = logging.getLogger(__name__)
@@ -30,6 +40,206 @@ DEFAULT_SCORES = {
     "failure_awareness_avg": 1.0,
     "dsa_predict_skill": 1.0,
 }
+# SkillScores is frozen, so one default instance is shared by all fallbacks
+_DEFAULT_SKILL_SCORES = SkillScores(**DEFAULT_SCORES)
+
+
+def _dumps(obj: Any) -> str:
+    """JSON-encode a parameter bound as text and cast to ::jsonb in SQL."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _loads(data: str) -> Any:
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+_SCORE_COLUMNS = """user_id,
+               COALESCE(clarity_avg, 1.0) AS clarity_avg,
+               COALESCE(tradeoff_avg, 1.0) AS tradeoff_avg,
+               COALESCE(adaptability_avg, 1.0) AS adaptability_avg,
+               COALESCE(failure_awareness_avg, 1.0) AS failure_awareness_avg,
+               COALESCE(dsa_predict_skill, 1.0) AS dsa_predict_skill,
+               next_module,
+               last_update"""
+
+# Auto-init + score read, used only when the plain read below misses. A row
+# inserted by the CTE is not visible to the outer query's snapshot, so it
+# comes from RETURNING; an existing row (concurrent init) from the table. (DO UPDATE ... RETURNING would also be one round trip,
+# but it rewrites the row and fires the updated_at trigger on every read.)
+_STATE_CTE = f"""
+    ins AS (
+        INSERT INTO public.user_state (user_id)
+        VALUES ($1)
+        ON CONFLICT (user_id) DO NOTHING
+        RETURNING user_id, clarity_avg, tradeoff_avg, adaptability_avg,
+                  failure_awareness_avg, dsa_predict_skill, next_module, last_update
+    ), cur AS (
+        SELECT user_id, clarity_avg, tradeoff_avg, adaptability_avg,
+               failure_awareness_avg, dsa_predict_skill, next_module, last_update
+        FROM ins
+        UNION ALL
+        SELECT user_id, clarity_avg, tradeoff_avg, adaptability_avg,
+               failure_awareness_avg, dsa_predict_skill, next_module, last_update
+        FROM public.user_state
+        WHERE user_id = $1
+    ), s AS (
+        SELECT {_SCORE_COLUMNS}
+        FROM cur
+        LIMIT 1
+    )
+"""
+
+# Plain read with no INSERT attempt: the steady-state path for existing
+# users, on the primary and on a replica. A missing row (new user, or
+# replication lag) returns nothing and the caller falls back to auto-init.
+_READ_STATE_CTE = f"""
+    s AS (
+        SELECT {_SCORE_COLUMNS}
+        FROM public.user_state
+        WHERE user_id = $1
+    )
+"""
+
+_FETCH_OR_INIT_SQL = f"WITH {_STATE_CTE} SELECT * FROM s"
+_READ_STATE_SQL = f"WITH {_READ_STATE_CTE} SELECT * FROM s"
+
+# Everything get_user_state() needs in one round trip: scores, onboarding
+# context, the last 10 decisions and per-module visit counts (as parallel
+# arrays, so no jsonb decoding is needed).
+_FULL_STATE_TAIL_TEMPLATE = """,
+    d AS (
+        SELECT next_module, created_at
+        FROM orchestrator_decisions
+        WHERE user_id = $1
+    )
+    SELECT s.*,
+           {onboarding_columns},
+           (SELECT array_agg(next_module ORDER BY created_at DESC)
+            FROM (SELECT next_module, created_at FROM d
+                  ORDER BY created_at DESC LIMIT 10) r
+           ) AS recent_modules,
+           c.visit_modules,
+           c.visit_counts
+    FROM s
+    {onboarding_join}
+    LEFT JOIN LATERAL (
+        SELECT array_agg(next_module) AS visit_modules,
+               array_agg(cnt) AS visit_counts
+        FROM (SELECT next_module, COUNT(*) AS cnt FROM d GROUP BY next_module) g
+    ) c ON true
+"""
+
+_FULL_STATE_TAIL = _FULL_STATE_TAIL_TEMPLATE.format(
+    onboarding_columns="o.target_role, o.primary_focus",
+    onboarding_join="LEFT JOIN user_onboarding o ON o.user_id = $1",
+)
+# Same minus the onboarding join, so a missing/broken user_onboarding table
+# doesn't also cost the decision history.
+_HISTORY_STATE_TAIL = _FULL_STATE_TAIL_TEMPLATE.format(
+    onboarding_columns="NULL::text AS target_role, NULL::text AS primary_focus",
+    onboarding_join="",
+)
+
+_FETCH_FULL_STATE_SQL = f"WITH {_STATE_CTE}{_FULL_STATE_TAIL}"
+_READ_FULL_STATE_SQL = f"WITH {_READ_STATE_CTE}{_FULL_STATE_TAIL}"
+_FETCH_HISTORY_STATE_SQL = f"WITH {_STATE_CTE}{_HISTORY_STATE_TAIL}"
+_READ_HISTORY_STATE_SQL = f"WITH {_READ_STATE_CTE}{_HISTORY_STATE_TAIL}"
+
+# (description, plain read, auto-init read), tried in order until one
+# succeeds; the onboarding/decision tables might not exist yet.
+_STATE_QUERIES = (
+    ("full state", _READ_FULL_STATE_SQL, _FETCH_FULL_STATE_SQL),
+    ("state without onboarding", _READ_HISTORY_STATE_SQL, _FETCH_HISTORY_STATE_SQL),
+    ("scores only", _READ_STATE_SQL, _FETCH_OR_INIT_SQL),
+)
+
+
+# One statement per batch: rows arrive as parallel arrays. (COPY would be
+# cheaper still, but COPY FROM is rejected on RLS-enabled tables for roles
+# that don't bypass RLS, and orchestrator_decisions has RLS on.)
+_INSERT_DECISIONS_SQL = """
+    INSERT INTO orchestrator_decisions
+        (id, user_id, input_snapshot, next_module, depth, reason)
+    SELECT * FROM unnest(
+        $1::uuid[], $2::uuid[], $3::jsonb[], $4::text[], $5::int[], $6::text[]
+    )
+"""
+
+_INSERT_DECISION_SQL = """
+    INSERT INTO orchestrator_decisions
+        (id, user_id, input_snapshot, next_module, depth, reason)
+    VALUES ($1, $2, $3::jsonb, $4, $5, $6)
+"""
+
+_UPDATE_NEXT_MODULE_SQL = """
+    UPDATE public.user_state
+    SET next_module = $2, last_update = NOW()
+    WHERE user_id = $1
+"""
+
+# Postgres builds the whole response array; we decode one JSON document
+# instead of converting Records to dicts row by row.
+_DECISION_HISTORY_SQL = """
+    SELECT COALESCE(
+        json_agg(
+            json_build_object(
+                'id', id,
+                'next_module', next_module,
+                'depth', depth,
+                'reason', reason,
+                'created_at', created_at,
+                'input_snapshot', input_snapshot
+            ) ORDER BY created_at DESC
+        ),
+        '[]'::json
+    )
+    FROM (
+        SELECT id, next_module, depth, reason, created_at, input_snapshot
+        FROM orchestrator_decisions
+        WHERE user_id = $1
+        ORDER BY created_at DESC
+        LIMIT $2
+    ) recent
+"""
+
+# (id, user_id, input_snapshot_json, next_module, depth, reason)
+DecisionRow = Tuple[str, str, str, str, int, str]
+
+
+class DecisionLogWriter(BatchWriter[DecisionRow]):
+    """
+    Buffers decision audit rows and writes them in batches off the
+    request path (unbounded buffer). Flush listeners are told which users
+    a written batch touched.
+    """
+
+    insert_sql = _INSERT_DECISIONS_SQL
+    name = "decision log"
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        flush_interval_s: float = 0.2,
+        max_batch: int = 500,
+    ):
+        super().__init__(pool, flush_interval_s, max_batch)
+        self._flush_listeners: List[Callable[[List[str]], None]] = []
+
+    def add_flush_listener(self, callback: Callable[[List[str]], None]) -> None:
+        """Call `callback(user_ids)` after each batch is written."""
+        self._flush_listeners.append(callback)
+
+    def _on_flush_error(self, batch: List[DecisionRow], error: Exception) -> None:
+        # Audit trail is best-effort, same as the inline insert
+        logger.warning(f"Failed to persist {len(batch)} decisions: {error}")
+
+    def _on_flushed(self, batch: List[DecisionRow]) -> None:
+        user_ids = [row[1] for row in batch]
+        for callback in self._flush_listeners:
+            callback(user_ids)
 
 
 class StateManager:
@@ -43,128 +253,225 @@ class StateManager:
     4. Track module visit history
     """
 
-    def __init__(self, pool: asyncpg.Pool):
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        decision_writer: Optional[DecisionLogWriter] = None,
+        cache_ttl_s: float = 5.0,
+        cache_max_entries: int = 10_000,
+        replica_pool: Optional[asyncpg.Pool] = None,
+    ):
         self.pool = pool
+        # Optional read replica for state/history reads; writes and
+        # auto-init always go to the primary pool.
+        self.replica_pool = replica_pool
+        self.decision_writer = decision_writer
+        # user_id -> (loaded_at, UserState, source row values); cleared on
+        # our own writes and by callers that write user_state in this
+        # process (invalidate()). Writes from other processes, e.g. the
+        # standalone evaluator feeding main_v2, show up within one TTL.
+        # Expired entries stay until reloaded so an unchanged row can
+        # reuse the previous UserState.
+        self.cache_ttl_s = cache_ttl_s
+        self.cache_max_entries = cache_max_entries
+        self._cache: Dict[str, Tuple[float, UserState, tuple]] = {}
+        self._inflight: Dict[str, "asyncio.Task[UserState]"] = {}
+        # user_id -> time of our last write; for one TTL after it, reads go
+        # to the primary so a lagging replica can't hand back (and cache)
+        # the pre-write row.
+        self._written_at: Dict[str, float] = {}
+        if decision_writer:
+            # Batched decisions land after record_decision() returns; drop
+            # any snapshot loaded in between once they are written.
+            decision_writer.add_flush_listener(self._invalidate_many)
 
     async def get_user_state(self, user_id: str) -> UserState:
         """
         Fetch complete user state snapshot.
 
-        Flow:
-        1. Ensure user_state row exists (auto-init)
-        2. Fetch scores
-        3. Fetch onboarding context (target_role, primary_focus)
-        4. Fetch recent module history from decisions table
-        5. Assemble into UserState model
+        Served from a short TTL cache when possible; concurrent misses for
+        the same user share one DB load, and a reload that finds the same
+        row returns the previous object. Treat the result as read-only.
+        """
+        now = time.monotonic()
+        hit = self._cache.get(user_id)
+        if hit is not None and now - hit[0] < self.cache_ttl_s:
+            return hit[1]
+
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load_user_state(user_id))
+            self._inflight[user_id] = task
+            task.add_done_callback(lambda t: self._inflight_done(user_id, t))
+        return await asyncio.shield(task)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop cached / in-flight state for a user after a write."""
+        self._cache.pop(user_id, None)
+        self._inflight.pop(user_id, None)
+        if self.replica_pool is not None:
+            now = time.monotonic()
+            self._written_at.pop(user_id, None)
+            self._written_at[user_id] = now
+            if len(self._written_at) > self.cache_max_entries:
+                # Oldest-first (dict insertion order); stop at the first
+                # write still inside the window
+                horizon = now - self.cache_ttl_s
+                for uid, ts in list(self._written_at.items()):
+                    if ts >= horizon and len(self._written_at) <= self.cache_max_entries:
+                        break
+                    del self._written_at[uid]
+
+    def _recently_written(self, user_id: str) -> bool:
+        ts = self._written_at.get(user_id)
+        if ts is None:
+            return False
+        if time.monotonic() - ts < self.cache_ttl_s:
+            return True
+        del self._written_at[user_id]
+        return False
+
+    def _inflight_done(self, user_id: str, task: "asyncio.Task[UserState]") -> None:
+        if self._inflight.get(user_id) is task:
+            del self._inflight[user_id]
+
+    def _invalidate_many(self, user_ids: List[str]) -> None:
+        for uid in user_ids:
+            self.invalidate(uid)
+
+    def _cache_put(self, user_id: str, state: UserState, row_key: tuple) -> None:
+        if self.cache_ttl_s <= 0:
+            return
+        now = time.monotonic()
+        self._cache.pop(user_id, None)
+        self._cache[user_id] = (now, state, row_key)
+        if len(self._cache) > self.cache_max_entries:
+            # Drop expired entries, then oldest-first (dict insertion order)
+            ttl = self.cache_ttl_s
+            for uid in [u for u, (ts, _, _) in self._cache.items() if now - ts >= ttl]:
+                del self._cache[uid]
+            while len(self._cache) > self.cache_max_entries:
+                del self._cache[next(iter(self._cache))]
+
+    async def _load_user_state(self, user_id: str) -> UserState:
+        """
+        Load the snapshot from the database and cache it on success.
+
+        One round trip for existing users that:
+        1. Reads scores (new users get a second query that auto-inits)
+        2. Joins onboarding context (target_role, primary_focus)
+        3. Aggregates recent module history + visit counts from decisions
+        Then assembles the UserState model.
         """
         start = time.monotonic()
         try:
-            async with self.pool.acquire() as conn:
-                # 1. Ensure row exists
-                await conn.execute("""
-                    INSERT INTO public.user_state (user_id)
-                    VALUES ($1)
-                    ON CONFLICT (user_id) DO NOTHING
-                """, user_id)
-
-                # 2. Fetch scores
-                row = await conn.fetchrow("""
-                    SELECT user_id,
-                           COALESCE(clarity_avg, 1.0) AS clarity_avg,
-                           COALESCE(tradeoff_avg, 1.0) AS tradeoff_avg,
-                           COALESCE(adaptability_avg, 1.0) AS adaptability_avg,
-                           COALESCE(failure_awareness_avg, 1.0) AS failure_awareness_avg,
-                           COALESCE(dsa_predict_skill, 1.0) AS dsa_predict_skill,
-                           next_module,
-                           last_update
-                    FROM public.user_state
-                    WHERE user_id = $1
-                """, user_id)
-
-                if not row:
-                    logger.warning(f"User {user_id} not found after upsert, using defaults")
-                    return UserState(
-                        user_id=user_id,
-                        scores=SkillScores(**DEFAULT_SCORES),
-                    )
-
-                scores = SkillScores(
-                    clarity_avg=row["clarity_avg"],
-                    tradeoff_avg=row["tradeoff_avg"],
-                    adaptability_avg=row["adaptability_avg"],
-                    failure_awareness_avg=row["failure_awareness_avg"],
-                    dsa_predict_skill=row["dsa_predict_skill"],
-                )
-
-                # 3. Fetch onboarding context
-                target_role = None
-                primary_focus = None
-                try:
-                    onboarding = await conn.fetchrow("""
-                        SELECT target_role, primary_focus
-                        FROM user_onboarding
-                        WHERE user_id = $1
-                    """, user_id)
-                    if onboarding:
-                        target_role = onboarding.get("target_role")
-                        primary_focus = onboarding.get("primary_focus")
-                except Exception:
-                    pass  # Table might not exist yet
-
-                # 4. Fetch recent module history (last 10 decisions)
-                recent_modules = []
-                module_visit_counts: Dict[str, int] = {}
-                try:
-                    decision_rows = await conn.fetch("""
-                        SELECT next_module
-                        FROM orchestrator_decisions
-                        WHERE user_id = $1
-                        ORDER BY created_at DESC
-                        LIMIT 10
-                    """, user_id)
-                    recent_modules = [r["next_module"] for r in decision_rows]
-
-                    # Count total visits per module
-                    count_rows = await conn.fetch("""
-                        SELECT next_module, COUNT(*) as cnt
-                        FROM orchestrator_decisions
-                        WHERE user_id = $1
-                        GROUP BY next_module
-                    """, user_id)
-                    module_visit_counts = {r["next_module"]: r["cnt"] for r in count_rows}
-                except Exception:
-                    pass  # Table might not exist yet
-
-                elapsed = (time.monotonic() - start) * 1000
-                logger.debug(f"State fetch for {user_id} took {elapsed:.1f}ms")
-
+            row = None
+            if self.replica_pool is not None and not self._recently_written(user_id):
+                row = await self._read_replica_state(user_id)
+            if row is None:
+                async with self.pool.acquire() as conn:
+                    row = await self._fetch_state_row(conn, user_id)
+
+            if not row:
+                logger.warning(f"User {user_id} not found after upsert, using defaults")
                 return UserState(
                     user_id=user_id,
-                    scores=scores,
-                    next_module=row["next_module"],
-                    last_update=row["last_update"],
-                    target_role=target_role,
-                    primary_focus=primary_focus,
-                    recent_modules=recent_modules,
-                    module_visit_counts=module_visit_counts,
+                    scores=_DEFAULT_SKILL_SCORES,
                 )
 
+            # TTL expired but nothing changed: hand back the same object
+            row_key = tuple(row)
+            prev = self._cache.get(user_id)
+            if prev is not None and prev[2] == row_key:
+                state = prev[1]
+                if self._inflight.get(user_id) is asyncio.current_task():
+                    self._cache_put(user_id, state, row_key)
+                return state
+
+            scores = SkillScores(
+                clarity_avg=row["clarity_avg"],
+                tradeoff_avg=row["tradeoff_avg"],
+                adaptability_avg=row["adaptability_avg"],
+                failure_awareness_avg=row["failure_awareness_avg"],
+                dsa_predict_skill=row["dsa_predict_skill"],
+            )
+            target_role = row.get("target_role")
+            primary_focus = row.get("primary_focus")
+            recent_modules = row.get("recent_modules") or []
+            module_visit_counts: Dict[str, int] = dict(
+                zip(row.get("visit_modules") or (), row.get("visit_counts") or ())
+            )
+
+            elapsed = (time.monotonic() - start) * 1000
+            logger.debug(f"State fetch for {user_id} took {elapsed:.1f}ms")
+
+            state = UserState(
+                user_id=user_id,
+                scores=scores,
+                next_module=row["next_module"],
+                last_update=row["last_update"],
+                target_role=target_role,
+                primary_focus=primary_focus,
+                recent_modules=recent_modules,
+                module_visit_counts=module_visit_counts,
+            )
+            # Skip caching if a write invalidated this user mid-load
+            if self._inflight.get(user_id) is asyncio.current_task():
+                self._cache_put(user_id, state, row_key)
+            return state
+
         except Exception as e:
             logger.error(f"Failed to fetch user state for {user_id}: {e}")
             return UserState(
                 user_id=user_id,
-                scores=SkillScores(**DEFAULT_SCORES),
+                scores=_DEFAULT_SKILL_SCORES,
             )
 
+    @staticmethod
+    async def _fetch_state_row(
+        conn: asyncpg.Connection, user_id: str
+    ) -> Optional[asyncpg.Record]:
+        """
+        Read (or auto-init) the snapshot on the primary, degrading one
+        join at a time if the full query fails.
+        """
+        last = len(_STATE_QUERIES) - 1
+        for i, (label, read_sql, init_sql) in enumerate(_STATE_QUERIES):
+            try:
+                row = await conn.fetchrow(read_sql, user_id)
+                if row is None:
+                    # First visit: auto-init the row and read back
+                    row = await conn.fetchrow(init_sql, user_id)
+                return row
+            except asyncpg.PostgresError as e:
+                if i == last:
+                    raise
+                logger.warning(
+                    f"{label.capitalize()} query failed for {user_id}, "
+                    f"trying {_STATE_QUERIES[i + 1][0]}: {e}"
+                )
+        return None
+
+    async def _read_replica_state(self, user_id: str) -> Optional[asyncpg.Record]:
+        """
+        Read the snapshot from the replica without auto-init.
+
+        Returns None when the row is missing there (new user, or not yet
+        replicated) or the replica errors, so the caller uses the primary.
+        """
+        try:
+            async with self.replica_pool.acquire() as conn:
+                return await conn.fetchrow(_READ_FULL_STATE_SQL, user_id)
+        except Exception as e:
+            logger.debug(f"Replica state read failed for {user_id}: {e}")
+            return None
+
     async def update_next_module(self, user_id: str, module: str) -> bool:
         """Update the next_module field in user_state."""
         try:
             async with self.pool.acquire() as conn:
-                await conn.execute("""
-                    UPDATE public.user_state
-                    SET next_module = $2, last_update = NOW()
-                    WHERE user_id = $1
-                """, user_id, module)
+                await conn.execute(_UPDATE_NEXT_MODULE_SQL, user_id, module)
+                self.invalidate(user_id)
                 return True
         except Exception as e:
             logger.error(f"Failed to update next_module for {user_id}: {e}")
@@ -178,16 +485,13 @@ class StateManager:
         """
         Persist a decision to the audit trail.
         Returns the decision ID if successful.
+
+        With a decision_writer the row is queued and written in the next
+        batch; the ID is generated here so it can be returned immediately.
         """
         try:
-            depth_int = {
-                "normal": 1,
-                "remediation": 2,
-                "critical": 3,
-                "onboarding": 0,
-            }.get(decision.depth.value, 1)
-
-            input_snapshot = json.dumps({
+            decision_id = str(uuid.uuid4())
+            input_snapshot = _dumps({
                 "scores": decision.scores,
                 "weakness_trigger": decision.weakness_trigger,
                 "confidence": decision.confidence,
@@ -196,22 +500,27 @@ class StateManager:
                     for cs in decision.candidate_scores[:5]
                 ],
             })
+            row: DecisionRow = (
+                decision_id,
+                user_id,
+                input_snapshot,
+                decision.next_module,
+                decision.depth.as_int,
+                decision.reason,
+            )
 
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow("""
-                    INSERT INTO orchestrator_decisions
-                        (user_id, input_snapshot, next_module, depth, reason)
-                    VALUES ($1, $2::jsonb, $3, $4, $5)
-                    RETURNING id
-                """, user_id, input_snapshot, decision.next_module,
-                    depth_int, decision.reason)
-
-                decision_id = str(row["id"]) if row else None
-                logger.info(
-                    f"Decision #{decision_id}: {user_id} → {decision.next_module} "
-                    f"(depth={decision.depth.value}, confidence={decision.confidence:.2f})"
-                )
-                return decision_id
+            self.invalidate(user_id)
+            if self.decision_writer:
+                self.decision_writer.submit(row)
+            else:
+                async with self.pool.acquire() as conn:
+                    await conn.execute(_INSERT_DECISION_SQL, *row)
+
+            logger.info(
+                f"Decision #{decision_id}: {user_id} → {decision.next_module} "
+                f"(depth={decision.depth.value}, confidence={decision.confidence:.2f})"
+            )
+            return decision_id
 
         except Exception as e:
             logger.warning(f"Failed to persist decision for {user_id}: {e}")
@@ -220,17 +529,14 @@ class StateManager:
     async def get_decision_history(
         self, user_id: str, limit: int = 10
     ) -> List[Dict[str, Any]]:
-        """Fetch recent decisions for a user (audit trail)."""
+        """
+        Fetch recent decisions for a user (audit trail), newest first.
+        Values are JSON-native: id and created_at as strings,
+        input_snapshot as a dict.
+        """
         try:
-            async with self.pool.acquire() as conn:
-                rows = await conn.fetch("""
-                    SELECT id, next_module, depth, reason, created_at, input_snapshot
-                    FROM orchestrator_decisions
-                    WHERE user_id = $1
-                    ORDER BY created_at DESC
-                    LIMIT $2
-                """, user_id, limit)
-                return [dict(r) for r in rows]
+            async with (self.replica_pool or self.pool).acquire() as conn:
+                return _loads(await conn.fetchval(_DECISION_HISTORY_SQL, user_id, limit))
         except Exception as e:
             logger.error(f"Failed to fetch decision history: {e}")
             return []
@@ -239,9 +545,23 @@ class StateManager:
 # ── Legacy compatibility ──────────────────────────────────────────
 # These functions match the old state.py API so existing code still works.
 
+# id(pool) -> (pool, manager); one manager per pool so the legacy wrappers
+# share its state cache. asyncpg.Pool has __slots__ without __weakref__,
+# so the pool is held alongside and checked by identity instead.
+_legacy_managers: Dict[int, Tuple[asyncpg.Pool, StateManager]] = {}
+
+
+def _get_manager(pool: asyncpg.Pool) -> StateManager:
+    entry = _legacy_managers.get(id(pool))
+    if entry is None or entry[0] is not pool:
+        entry = (pool, StateManager(pool))
+        _legacy_managers[id(pool)] = entry
+    return entry[1]
+
+
 async def fetch_user_state(pool: asyncpg.Pool, user_id: str) -> dict:
     """Legacy wrapper — returns a plain dict like the old state.py."""
-    mgr = StateManager(pool)
+    mgr = _get_manager(pool)
     state = await mgr.get_user_state(user_id)
     return {
         "user_id": state.user_id,
@@ -257,5 +577,5 @@ async def fetch_user_state(pool: asyncpg.Pool, user_id: str) -> dict:
 
 async def update_next_module(pool: asyncpg.Pool, user_id: str, next_module: str) -> bool:
     """Legacy wrapper."""
-    mgr = StateManager(pool)
+    mgr = _get_manager(pool)
     return await mgr.update_next_module(user_id, next_module)
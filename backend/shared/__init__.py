@@ -1,5 +1,6 @@
 # Shared Module
 
-from .memory import UserMemory, create_user_memory
+from .batch_writer import BatchWriter
+from .memory import MemoryEventWriter, UserMemory, create_user_memory
 
-__all__ = ["UserMemory", "create_user_memory"]
+__all__ = ["BatchWriter", "MemoryEventWriter", "UserMemory", "create_user_memory"]
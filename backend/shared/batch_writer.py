@@ -0,0 +1,107 @@
+"""
+Batched background writer shared by the orchestrator's decision audit log
+and the user memory event log.
+
+Rows are queued synchronously from the request path; a background task
+flushes them every flush_interval_s, or as soon as max_batch rows are
+waiting, with a single INSERT per batch. Subclasses supply the SQL (rows
+are bound as parallel arrays, so it is typically an unnest INSERT) and
+what to do after a batch lands.
+"""
+
+import asyncio
+import logging
+from typing import Generic, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+Row = TypeVar("Row", bound=tuple)
+
+
+class BatchWriter(Generic[Row]):
+    """
+    Buffers rows and writes them in batches off the request path.
+
+    max_pending bounds the buffer (0 = unbounded); when it is full,
+    submit()/submit_many() return False and the caller writes inline.
+    stop() lets an in-flight batch finish, then drains what's left.
+    """
+
+    insert_sql: str = ""
+    name: str = "batch"  # for log lines
+
+    def __init__(
+        self,
+        pool,
+        flush_interval_s: float,
+        max_batch: int = 500,
+        max_pending: int = 0,
+    ):
+        self.pool = pool
+        self.flush_interval_s = flush_interval_s
+        self.max_batch = max_batch
+        self._queue: "asyncio.Queue[Row]" = asyncio.Queue(maxsize=max_pending)
+        self._task: Optional[asyncio.Task] = None
+        self._batch_ready = asyncio.Event()
+        self._stopping = False
+
+    def submit(self, row: Row) -> bool:
+        """Queue one row for the next batch; False (not queued) if full."""
+        return self.submit_many((row,))
+
+    def submit_many(self, rows: Sequence[Row]) -> bool:
+        """Queue rows for the next batch; False (nothing queued) if full."""
+        maxsize = self._queue.maxsize
+        if maxsize and maxsize - self._queue.qsize() < len(rows):
+            return False
+        for row in rows:
+            self._queue.put_nowait(row)
+        if self._queue.qsize() >= self.max_batch:
+            self._batch_ready.set()
+        return True
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"📝 {self.name.capitalize()} writer started (interval={self.flush_interval_s}s)")
+
+    async def stop(self):
+        # Let the loop finish its current batch rather than cancelling an
+        # INSERT halfway through (that batch would be lost).
+        if self._task:
+            self._stopping = True
+            self._batch_ready.set()
+            await self._task
+            self._task = None
+        while not self._queue.empty():
+            await self._flush()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            while not self._queue.empty():
+                await self._flush()
+
+    async def _flush(self):
+        batch: List[Row] = []
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if not batch:
+            return
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.execute(self.insert_sql, *zip(*batch))
+        except Exception as e:
+            self._on_flush_error(batch, e)
+            return
+        self._on_flushed(batch)
+
+    def _on_flush_error(self, batch: List[Row], error: Exception) -> None:
+        logger.error(f"Failed to write {len(batch)} {self.name} rows: {error}")
+
+    def _on_flushed(self, batch: List[Row]) -> None:
+        """Called after a batch has been written."""
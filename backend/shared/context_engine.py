@@ -14,13 +14,38 @@ single prompt with per-block token budgets to prevent overflow.
 """
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """
+    BPE encoding for exact budgets, loaded once per process on first use
+    (get_encoding may fetch its rank file). None → 4-chars-per-token
+    heuristic.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, using char estimate: {e}")
+        return None
+
+
 def count_tokens(text: str) -> int:
-    """Approximate token count (4 chars ≈ 1 token)."""
+    """Token count (BPE when tiktoken is installed, else 4 chars ≈ 1 token)."""
+    enc = _get_encoding()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
     return len(text) // 4
 
 
@@ -31,16 +56,27 @@ def maybe_summarize_block(text: str, block_name: str, max_tokens: int = 800) ->
     
     For production, use an LLM to summarize instead of truncating.
     """
-    current_tokens = count_tokens(text)
-    if current_tokens <= max_tokens:
-        return text
-
-    # Truncate to budget (keep first portion + note)
-    char_budget = max_tokens * 4
-    truncated = text[:char_budget]
-    truncated += f"\n\n[...{block_name} truncated from {current_tokens} to ~{max_tokens} tokens]"
+    enc = _get_encoding()
+    if enc is not None:
+        # Encode once; cut on a token boundary for an exact budget
+        tokens = enc.encode(text, disallowed_special=())
+        current_tokens = len(tokens)
+        if current_tokens <= max_tokens:
+            return text
+        # A token boundary can fall inside a multibyte character; drop the
+        # partial trailing bytes instead of emitting U+FFFD
+        kept = enc.decode_bytes(tokens[:max_tokens]).decode("utf-8", errors="ignore")
+    else:
+        # Same estimate as count_tokens(), inlined: blocks under budget (the
+        # common case) return after one len() without touching the string.
+        current_tokens = len(text) // 4
+        if current_tokens <= max_tokens:
+            return text
+        kept = text[:max_tokens * 4]
+
+    # Truncate to budget (keep first portion + note) — one slice, one concat
     logger.debug(f"Truncated {block_name}: {current_tokens} → ~{max_tokens} tokens")
-    return truncated
+    return f"{kept}\n\n[...{block_name} truncated from {current_tokens} to ~{max_tokens} tokens]"
 
 
 def build_context_prompt(
@@ -68,11 +104,14 @@ def build_context_prompt(
 
     # 1. User profile
     if user_profile:
-        profile_text = f"Name: {user_profile.get('name', 'Unknown')}\n"
-        profile_text += f"Focus: {user_profile.get('primary_focus', 'general')}\n"
-        profile_text += f"Experience: {user_profile.get('experience_level', 'unknown')}\n"
+        profile_lines = [
+            f"Name: {user_profile.get('name', 'Unknown')}\n",
+            f"Focus: {user_profile.get('primary_focus', 'general')}\n",
+            f"Experience: {user_profile.get('experience_level', 'unknown')}\n",
+        ]
         if user_profile.get('skills'):
-            profile_text += f"Skills: {', '.join(user_profile['skills'][:10])}\n"
+            profile_lines.append(f"Skills: {', '.join(user_profile['skills'][:10])}\n")
+        profile_text = "".join(profile_lines)
         sections.append(
             f"--- User Profile ---\n{maybe_summarize_block(profile_text, 'profile', profile_budget)}"
         )
@@ -85,12 +124,13 @@ def build_context_prompt(
 
     # 3. Recent activity
     if recent_events:
-        events_text = ""
+        event_lines = []
         for ev in recent_events[:15]:
             module = ev.get("module", "?")
             obs = ev.get("observation", "")[:120]
             metric = f" ({ev['metric_name']}: {ev['metric_value']:.2f})" if ev.get("metric_value") is not None else ""
-            events_text += f"- [{module}] {obs}{metric}\n"
+            event_lines.append(f"- [{module}] {obs}{metric}\n")
+        events_text = "".join(event_lines)
         sections.append(
             f"--- Recent Activity ({len(recent_events)} events) ---\n"
             f"{maybe_summarize_block(events_text, 'events', events_budget)}"
@@ -98,13 +138,14 @@ def build_context_prompt(
 
     # 4. Detected patterns
     if patterns:
-        patterns_text = ""
+        pattern_lines = []
         for p in patterns[:8]:
             ptype = p.get("pattern_type", "?")
             desc = p.get("description", "")
             conf = p.get("confidence", 0)
             count = p.get("occurrence_count", 0)
-            patterns_text += f"- {ptype}: {desc} (confidence: {conf:.0%}, occurrences: {count})\n"
+            pattern_lines.append(f"- {ptype}: {desc} (confidence: {conf:.0%}, occurrences: {count})\n")
+        patterns_text = "".join(pattern_lines)
         sections.append(
             f"--- Detected Patterns ---\n"
             f"{maybe_summarize_block(patterns_text, 'patterns', patterns_budget)}"
@@ -120,23 +161,24 @@ def build_context_prompt(
     if stats:
         event_counts = stats.get("event_counts", {})
         avg_scores = stats.get("avg_scores", {})
-        stats_text = f"Total events (30d): {stats.get('total_events_30d', 0)}\n"
+        stats_lines = [f"Total events (30d): {stats.get('total_events_30d', 0)}\n"]
         if event_counts:
-            stats_text += "Event distribution: " + ", ".join(
+            stats_lines.append("Event distribution: " + ", ".join(
                 f"{k}: {v}" for k, v in sorted(event_counts.items(), key=lambda x: -x[1])[:5]
-            ) + "\n"
+            ) + "\n")
         if avg_scores:
-            stats_text += "Average scores: " + ", ".join(
+            stats_lines.append("Average scores: " + ", ".join(
                 f"{k}: {v:.2f}" for k, v in sorted(avg_scores.items())[:8]
-            ) + "\n"
-        sections.append(f"--- Statistics ---\n{stats_text}")
+            ) + "\n")
+        sections.append(f"--- Statistics ---\n{''.join(stats_lines)}")
 
     # Assemble
     header = f"=== USER CONTEXT FOR {user_id[:8]}... ==="
     assembled = header + "\n\n" + "\n\n".join(sections)
 
-    total_tokens = count_tokens(assembled)
-    logger.info(f"Assembled context: {total_tokens} tokens, {len(sections)} sections")
+    # Estimate only: a BPE encode of the whole prompt just for a log line
+    # would cost more than the per-block budgeting above.
+    logger.info(f"Assembled context: ~{len(assembled) // 4} tokens, {len(sections)} sections")
 
     return assembled
 
@@ -7,14 +7,112 @@ weaknesses, and improvements across sessions.
 This is a Supabase-based alternative to Zep Cloud.
 """
 
+import asyncio
+import json
 import logging
 import os
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from .batch_writer import BatchWriter
+
 logger = logging.getLogger(__name__)
 
+# bulk_import() switches from the unnest INSERT to COPY at this many rows
+COPY_THRESHOLD = 100
+
+_MEMORY_COPY_COLUMNS = [
+    "user_id", "event_type", "module", "observation",
+    "metric_name", "metric_value", "tags", "context",
+]
+
+# In-process cache for get_weakness_summary(). Writes through UserMemory
+# invalidate; writes from other processes show up within the TTL.
+SUMMARY_CACHE_TTL_SECONDS = 30.0
+SUMMARY_CACHE_MAX_ENTRIES = 10_000
+
+# user_id -> (expires_at, summary), kept in LRU order
+_SUMMARY_CACHE: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+
+def _dumps(obj: Any) -> str:
+    """JSON-encode a parameter bound as text and cast to jsonb in SQL."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _summary_cache_put(user_id: str, summary: str) -> None:
+    _SUMMARY_CACHE[user_id] = (time.monotonic() + SUMMARY_CACHE_TTL_SECONDS, summary)
+    _SUMMARY_CACHE.move_to_end(user_id)
+    while len(_SUMMARY_CACHE) > SUMMARY_CACHE_MAX_ENTRIES:
+        _SUMMARY_CACHE.popitem(last=False)
+
+
+def invalidate_weakness_summary(user_id: str) -> None:
+    """Drop the cached weakness summary for a user."""
+    _SUMMARY_CACHE.pop(user_id, None)
+
+
+# Cross-user batch insert for MemoryEventWriter; ids are generated client-side
+# so record_event() can return one before the row is written.
+_INSERT_EVENTS_SQL = """
+    INSERT INTO user_memory (
+        id, user_id, event_type, module, observation,
+        metric_name, metric_value, tags, context
+    )
+    SELECT e.id, e.user_id, e.event_type, e.module, e.observation,
+           e.metric_name, e.metric_value,
+           ARRAY(SELECT jsonb_array_elements_text(e.tags)),
+           e.context
+    FROM unnest(
+        $1::uuid[], $2::uuid[], $3::text[], $4::text[], $5::text[],
+        $6::text[], $7::float8[], $8::jsonb[], $9::jsonb[]
+    ) AS e(id, user_id, event_type, module, observation,
+           metric_name, metric_value, tags, context)
+"""
+
+# (id, user_id, event_type, module, observation, metric_name, metric_value,
+#  tags_json, context_json)
+EventRow = Tuple[str, str, str, str, str, Optional[str], Optional[float], str, str]
+
+
+class MemoryEventWriter(BatchWriter[EventRow]):
+    """
+    Buffers memory events from all users and writes them in batches off
+    the request path.
+    
+    The buffer is bounded: when it is full, submit_many() returns False
+    and the caller writes inline. Each written batch invalidates the
+    cached weakness summaries of the users in it.
+    """
+    
+    insert_sql = _INSERT_EVENTS_SQL
+    name = "memory event"
+    
+    def __init__(
+        self,
+        pool,
+        flush_interval_s: float = 0.05,
+        max_batch: int = 500,
+        max_pending: int = 10_000,
+    ):
+        super().__init__(pool, flush_interval_s, max_batch, max_pending)
+    
+    def _on_flushed(self, batch: List[EventRow]) -> None:
+        for user_id in {row[1] for row in batch}:
+            invalidate_weakness_summary(user_id)
+
 
 class UserMemory:
     """
@@ -22,7 +120,13 @@ class UserMemory:
     Records events and retrieves patterns for orchestrator decisions.
     """
     
-    def __init__(self, user_id: str, pool=None, supabase_client=None):
+    def __init__(
+        self,
+        user_id: str,
+        pool=None,
+        supabase_client=None,
+        writer: Optional[MemoryEventWriter] = None
+    ):
         """
         Initialize memory for a user.
         
@@ -30,10 +134,37 @@ class UserMemory:
             user_id: UUID of the user
             pool: asyncpg connection pool (for direct DB access)
             supabase_client: Supabase client (for REST API access)
+            writer: Optional batch writer; events are then queued instead of
+                inserted inline (IDs are still returned immediately)
         """
         self.user_id = user_id
         self.pool = pool
         self.supabase = supabase_client
+        self.writer = writer
+    
+    def _queue_events(self, events: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """Hand events to the batch writer; None if there is none or it is full."""
+        if not self.writer:
+            return None
+        rows: List[EventRow] = [
+            (
+                str(uuid.uuid4()),
+                self.user_id,
+                ev["event_type"],
+                ev["module"],
+                ev["observation"],
+                ev.get("metric_name"),
+                ev.get("metric_value"),
+                _dumps(ev.get("tags") or []),
+                _dumps(ev.get("context") or {}),
+            )
+            for ev in events
+        ]
+        if not self.writer.submit_many(rows):
+            logger.warning("Memory event buffer full, writing inline")
+            return None
+        invalidate_weakness_summary(self.user_id)
+        return [row[0] for row in rows]
     
     # ==================== Recording Events ====================
     
@@ -60,12 +191,26 @@ class UserMemory:
             context: Optional additional structured data
         
         Returns:
-            Event ID if successful, None otherwise
+            Event ID if successful, None otherwise. With a writer the ID is
+            returned once the event is queued; the insert happens in the
+            next batch and a failure there is only logged.
         """
         if not self.pool:
             logger.warning("No database pool available for memory recording")
             return None
         
+        queued = self._queue_events([{
+            "event_type": event_type,
+            "module": module,
+            "observation": observation,
+            "metric_name": metric_name,
+            "metric_value": metric_value,
+            "tags": tags,
+            "context": context,
+        }])
+        if queued:
+            return queued[0]
+        
         try:
             async with self.pool.acquire() as conn:
                 result = await conn.fetchrow(
@@ -83,15 +228,123 @@ class UserMemory:
                     metric_name,
                     metric_value,
                     tags or [],
-                    context or {}
+                    _dumps(context or {})
                 )
                 event_id = str(result['id'])
+                invalidate_weakness_summary(self.user_id)
                 logger.info(f"Recorded memory event {event_id} for user {self.user_id[:8]}...")
                 return event_id
         except Exception as e:
             logger.error(f"Failed to record memory event: {e}")
             return None
     
+    async def record_events_bulk(self, events: List[Dict[str, Any]]) -> List[str]:
+        """
+        Record several memory events for this user in one INSERT.
+        
+        Args:
+            events: Dicts with the same keys as record_event() arguments
+                (event_type, module, observation required; the rest optional)
+        
+        Returns:
+            List of event IDs, in input order; empty on failure
+            (queued rather than written when a writer is set, as above)
+        """
+        if not events:
+            return []
+        if not self.pool:
+            logger.warning("No database pool available for memory recording")
+            return []
+        
+        queued = self._queue_events(events)
+        if queued:
+            return queued
+        
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    INSERT INTO user_memory (
+                        user_id, event_type, module, observation,
+                        metric_name, metric_value, tags, context
+                    )
+                    SELECT $1, e.event_type, e.module, e.observation,
+                           e.metric_name, e.metric_value,
+                           ARRAY(SELECT jsonb_array_elements_text(e.tags)),
+                           e.context
+                    FROM unnest(
+                        $2::text[], $3::text[], $4::text[], $5::text[],
+                        $6::float8[], $7::jsonb[], $8::jsonb[]
+                    ) AS e(event_type, module, observation, metric_name,
+                           metric_value, tags, context)
+                    RETURNING id
+                    """,
+                    self.user_id,
+                    [ev["event_type"] for ev in events],
+                    [ev["module"] for ev in events],
+                    [ev["observation"] for ev in events],
+                    [ev.get("metric_name") for ev in events],
+                    [ev.get("metric_value") for ev in events],
+                    # Ragged per-row text[] can't be a 2-D array param; pass JSON
+                    [_dumps(ev.get("tags") or []) for ev in events],
+                    [_dumps(ev.get("context") or {}) for ev in events],
+                )
+                event_ids = [str(row['id']) for row in rows]
+                invalidate_weakness_summary(self.user_id)
+                logger.info(f"Recorded {len(event_ids)} memory events for user {self.user_id[:8]}...")
+                return event_ids
+        except Exception as e:
+            logger.error(f"Failed to record memory events: {e}")
+            return []
+    
+    async def bulk_import(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Import a large batch of events for this user (backfills, imports).
+        
+        Batches of COPY_THRESHOLD rows or more are streamed with COPY;
+        smaller ones use record_events_bulk(). COPY is refused on RLS tables
+        for roles without BYPASSRLS, in which case this falls back to the
+        INSERT path as well.
+        
+        Returns:
+            Number of events written
+        """
+        if not events:
+            return 0
+        if not self.pool:
+            logger.warning("No database pool available for memory recording")
+            return 0
+        if len(events) < COPY_THRESHOLD:
+            return len(await self.record_events_bulk(events))
+        
+        records = [
+            (
+                self.user_id,
+                ev["event_type"],
+                ev["module"],
+                ev["observation"],
+                ev.get("metric_name"),
+                ev.get("metric_value"),
+                ev.get("tags") or [],
+                _dumps(ev.get("context") or {}),
+            )
+            for ev in events
+        ]
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.copy_records_to_table(
+                    "user_memory",
+                    schema_name="public",
+                    columns=_MEMORY_COPY_COLUMNS,
+                    records=records,
+                )
+            invalidate_weakness_summary(self.user_id)
+            logger.info(f"Imported {len(records)} memory events for user {self.user_id[:8]}...")
+            return len(records)
+        except Exception as e:
+            logger.warning(f"COPY into user_memory failed, using INSERT: {e}")
+            return len(await self.record_events_bulk(events))
+    
     async def record_interview_result(
         self,
         clarity_score: float,
@@ -101,12 +354,13 @@ class UserMemory:
         topic: str = "general"
     ) -> List[str]:
         """
-        Convenience method to record all interview metrics at once.
+        Convenience method to record all interview metrics at once
+        (a single INSERT for all four events).
         
         Returns:
             List of event IDs created
         """
-        event_ids = []
+        events = []
         metrics = [
             ("clarity", clarity_score),
             ("tradeoff", tradeoff_score),
@@ -129,18 +383,16 @@ class UserMemory:
                 observation = f"User completed {topic} interview with {metric_name} score: {score:.2f}"
                 tags = ["interview", metric_name, topic]
             
-            event_id = await self.record_event(
-                event_type=event_type,
-                module="interview",
-                observation=observation,
-                metric_name=metric_name,
-                metric_value=score,
-                tags=tags
-            )
-            if event_id:
-                event_ids.append(event_id)
+            events.append({
+                "event_type": event_type,
+                "module": "interview",
+                "observation": observation,
+                "metric_name": metric_name,
+                "metric_value": score,
+                "tags": tags,
+            })
         
-        return event_ids
+        return await self.record_events_bulk(events)
     
     async def record_course_progress(
         self,
@@ -198,47 +450,73 @@ class UserMemory:
     
     # ==================== Retrieving Memory ====================
     
-    async def get_recent_events(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """Get most recent memory events for this user."""
+    async def get_recent_events(
+        self,
+        limit: int = 20,
+        cursor: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get most recent memory events for this user.
+        
+        Args:
+            limit: Page size
+            cursor: (created_at, id) of the last row of the previous page;
+                returns the events strictly older than it (keyset pagination)
+        """
         if not self.pool:
             return []
         
+        keyset = "AND (created_at, id) < ($3, $4)" if cursor else ""
         try:
             async with self.pool.acquire() as conn:
                 rows = await conn.fetch(
-                    """
+                    f"""
                     SELECT * FROM user_memory
                     WHERE user_id = $1
-                    ORDER BY created_at DESC
+                      {keyset}
+                    ORDER BY created_at DESC, id DESC
                     LIMIT $2
                     """,
                     self.user_id,
-                    limit
+                    limit,
+                    *(cursor or ())
                 )
                 return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Failed to get recent events: {e}")
             return []
     
-    async def get_weakness_events(self, days: int = 30, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get weakness events from the last N days."""
+    async def get_weakness_events(
+        self,
+        days: int = 30,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get weakness events from the last N days.
+        
+        cursor works as in get_recent_events().
+        """
         if not self.pool:
             return []
         
+        keyset = "AND (created_at, id) < ($4, $5)" if cursor else ""
         try:
             async with self.pool.acquire() as conn:
                 rows = await conn.fetch(
-                    """
+                    f"""
                     SELECT * FROM user_memory
                     WHERE user_id = $1
                       AND event_type = 'weakness_detected'
                       AND created_at > now() - make_interval(days => $2)
-                    ORDER BY created_at DESC
+                      {keyset}
+                    ORDER BY created_at DESC, id DESC
                     LIMIT $3
                     """,
                     self.user_id,
                     days,
-                    limit
+                    limit,
+                    *(cursor or ())
                 )
                 return [dict(row) for row in rows]
         except Exception as e:
@@ -249,10 +527,18 @@ class UserMemory:
         """
         Get a text summary of user's weaknesses for LLM context.
         Uses the database function if available, otherwise calculates locally.
+        Cached per user for SUMMARY_CACHE_TTL_SECONDS.
         """
         if not self.pool:
             return "Memory system unavailable."
         
+        cached = _SUMMARY_CACHE.get(self.user_id)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                _SUMMARY_CACHE.move_to_end(self.user_id)
+                return cached[1]
+            del _SUMMARY_CACHE[self.user_id]
+        
         try:
             async with self.pool.acquire() as conn:
                 # Try using the database function first
@@ -261,34 +547,50 @@ class UserMemory:
                     self.user_id
                 )
                 if result:
+                    _summary_cache_put(self.user_id, result)
                     return result
         except Exception as e:
             logger.warning(f"Database function not available, calculating locally: {e}")
         
         # Fallback: calculate locally
         try:
-            events = await self.get_weakness_events(days=30)
-            if not events:
-                return "No significant weaknesses detected in the last 30 days."
-            
-            # Count by module/metric
-            counts = {}
-            scores = {}
-            for event in events:
-                key = f"{event.get('module')}/{event.get('metric_name')}"
-                counts[key] = counts.get(key, 0) + 1
-                if event.get('metric_value') is not None:
-                    if key not in scores:
-                        scores[key] = []
-                    scores[key].append(event['metric_value'])
+            # Same 50 most recent weakness events get_weakness_events() reads,
+            # grouped by module/metric; ties keep the most recent group first
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT module, metric_name,
+                           COUNT(*) AS count,
+                           COALESCE(AVG(metric_value), 0) AS avg_score
+                    FROM (
+                        SELECT module, metric_name, metric_value, created_at
+                        FROM user_memory
+                        WHERE user_id = $1
+                          AND event_type = 'weakness_detected'
+                          AND created_at > now() - INTERVAL '30 days'
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT 50
+                    ) e
+                    GROUP BY module, metric_name
+                    ORDER BY count DESC, MAX(created_at) DESC
+                    """,
+                    self.user_id
+                )
+            if not rows:
+                summary = "No significant weaknesses detected in the last 30 days."
+                _summary_cache_put(self.user_id, summary)
+                return summary
             
             # Format summary
             lines = ["User weakness patterns (last 30 days):"]
-            for key, count in sorted(counts.items(), key=lambda x: -x[1]):
-                avg_score = sum(scores.get(key, [0])) / len(scores.get(key, [1]))
-                lines.append(f"- {key}: {count} occurrences (avg: {avg_score:.2f})")
+            lines += [
+                f"- {row['module']}/{row['metric_name']}: {row['count']} occurrences (avg: {row['avg_score']:.2f})"
+                for row in rows
+            ]
             
-            return "\n".join(lines)
+            summary = "\n".join(lines)
+            _summary_cache_put(self.user_id, summary)
+            return summary
         except Exception as e:
             logger.error(f"Failed to calculate weakness summary: {e}")
             return "Error calculating weakness summary."
@@ -302,7 +604,10 @@ class UserMemory:
             async with self.pool.acquire() as conn:
                 rows = await conn.fetch(
                     """
-                    SELECT * FROM user_patterns
+                    SELECT id, pattern_type, module, metric_name, description,
+                           occurrence_count, avg_score, trend, confidence,
+                           last_seen_at
+                    FROM user_patterns
                     WHERE user_id = $1
                     ORDER BY confidence DESC, occurrence_count DESC
                     """,
@@ -327,6 +632,7 @@ class UserMemory:
                     "SELECT update_user_patterns($1)",
                     self.user_id
                 )
+                invalidate_weakness_summary(self.user_id)
                 return result or 0
         except Exception as e:
             logger.error(f"Failed to update patterns: {e}")
@@ -344,12 +650,19 @@ class UserMemory:
         - patterns: Detected patterns
         - stats: Aggregate statistics
         """
+        # Independent queries on separate pool connections: run them together
+        weakness_summary, recent_events, patterns, stats = await asyncio.gather(
+            self.get_weakness_summary(),
+            self.get_recent_events(limit=10),
+            self.get_patterns(),
+            self._calculate_stats(),
+        )
         context = {
             "user_id": self.user_id,
-            "weakness_summary": await self.get_weakness_summary(),
-            "recent_events": await self.get_recent_events(limit=10),
-            "patterns": await self.get_patterns(),
-            "stats": await self._calculate_stats()
+            "weakness_summary": weakness_summary,
+            "recent_events": recent_events,
+            "patterns": patterns,
+            "stats": stats
         }
         return context
     
@@ -360,35 +673,29 @@ class UserMemory:
         
         try:
             async with self.pool.acquire() as conn:
-                # Get event counts by type
+                # Event counts by type and average scores by module/metric,
+                # from one scan of the 30-day window
                 rows = await conn.fetch(
                     """
-                    SELECT event_type, COUNT(*) as count
+                    SELECT GROUPING(event_type) = 0 AS by_type,
+                           event_type, module, metric_name,
+                           COUNT(*) AS count,
+                           AVG(metric_value) AS avg_score
                     FROM user_memory
                     WHERE user_id = $1
                       AND created_at > now() - INTERVAL '30 days'
-                    GROUP BY event_type
+                    GROUP BY GROUPING SETS ((event_type), (module, metric_name))
                     """,
                     self.user_id
                 )
-                event_counts = {row['event_type']: row['count'] for row in rows}
-                
-                # Get average scores by module/metric
-                rows = await conn.fetch(
-                    """
-                    SELECT module, metric_name, AVG(metric_value) as avg_score
-                    FROM user_memory
-                    WHERE user_id = $1
-                      AND metric_value IS NOT NULL
-                      AND created_at > now() - INTERVAL '30 days'
-                    GROUP BY module, metric_name
-                    """,
-                    self.user_id
-                )
-                avg_scores = {
-                    f"{row['module']}/{row['metric_name']}": round(row['avg_score'], 3)
-                    for row in rows
-                }
+                event_counts = {}
+                avg_scores = {}
+                for row in rows:
+                    if row['by_type']:
+                        event_counts[row['event_type']] = row['count']
+                    elif row['avg_score'] is not None:
+                        # AVG skips NULLs; all-NULL groups had no scores
+                        avg_scores[f"{row['module']}/{row['metric_name']}"] = round(row['avg_score'], 3)
                 
                 return {
                     "event_counts": event_counts,
@@ -402,15 +709,20 @@ class UserMemory:
 
 # ==================== Factory Function ====================
 
-def create_user_memory(user_id: str, pool=None) -> UserMemory:
+def create_user_memory(
+    user_id: str,
+    pool=None,
+    writer: Optional[MemoryEventWriter] = None
+) -> UserMemory:
     """
     Factory function to create a UserMemory instance.
     
     Args:
         user_id: UUID of the user
         pool: asyncpg connection pool
+        writer: Optional MemoryEventWriter for batched, non-blocking writes
     
     Returns:
         UserMemory instance
     """
-    return UserMemory(user_id=user_id, pool=pool)
+    return UserMemory(user_id=user_id, pool=pool, writer=writer)
@@ -13,63 +13,86 @@ Usage:
     answer = await rag.query("Explain React hooks", context_from_search=results)
 """
 
+import hashlib
 import logging
-import math
 import os
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
 
 
-# ─────────────── Simple Vector Store (no external DB) ───────────────
+def _groq_headers() -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {GROQ_API_KEY}",
+        "Content-Type": "application/json",
+    }
 
-def _cosine_similarity(a: List[float], b: List[float]) -> float:
-    """Compute cosine similarity between two vectors."""
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
 
+# ─────────────── Simple Vector Store (no external DB) ───────────────
 
 class SimpleVectorStore:
     """In-memory vector store using cosine similarity (like Qdrant in-memory mode)."""
 
     def __init__(self):
         self.documents: List[str] = []
-        self.embeddings: List[List[float]] = []
         self.metadata: List[Dict[str, Any]] = []
+        # Unit-normalized rows, grown by doubling; only [:_n] is live
+        self._emb: Optional[np.ndarray] = None
+        self._n = 0
 
     def add(self, documents: List[str], embeddings: List[List[float]], metadata: List[Dict] = None):
+        vecs = np.asarray(embeddings, dtype=np.float32)
+        if vecs.ndim != 2 or len(vecs) == 0:
+            return
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0  # zero vectors stay zero (similarity 0)
+        vecs /= norms
+
+        needed = self._n + len(vecs)
+        if self._emb is None:
+            self._emb = np.empty((max(needed, 64), vecs.shape[1]), dtype=np.float32)
+        elif needed > len(self._emb):
+            grown = np.empty((max(needed, 2 * len(self._emb)), self._emb.shape[1]), dtype=np.float32)
+            grown[:self._n] = self._emb[:self._n]
+            self._emb = grown
+        self._emb[self._n:needed] = vecs
+        self._n = needed
+
         self.documents.extend(documents)
-        self.embeddings.extend(embeddings)
         self.metadata.extend(metadata or [{}] * len(documents))
 
     def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
-        if not self.embeddings:
+        if not self._n or top_k <= 0:
             return []
 
-        scored = []
-        for i, emb in enumerate(self.embeddings):
-            score = _cosine_similarity(query_embedding, emb)
-            scored.append((score, i))
+        q = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm:
+            q = q / norm
+        scores = self._emb[:self._n] @ q
 
-        scored.sort(reverse=True)
-        results = []
-        for score, idx in scored[:top_k]:
-            results.append({
-                "document": self.documents[idx],
+        # O(N) selection of the top k, then sort only those k
+        k = min(top_k, self._n)
+        idx = np.argpartition(-scores, k - 1)[:k]
+        idx = idx[np.argsort(-scores[idx], kind="stable")]
+
+        return [
+            {
+                "document": self.documents[i],
                 "score": round(score, 4),
-                "metadata": self.metadata[idx],
-            })
-        return results
+                "metadata": self.metadata[i],
+            }
+            for i, score in zip(idx.tolist(), scores[idx].tolist())
+        ]
 
     @property
     def size(self) -> int:
@@ -90,6 +113,7 @@ def chunk_text(text: str, chunk_size: int = 512, overlap: int = 64) -> List[str]
 
     chunks = []
     current_chunk: List[str] = []
+    current_counts: List[int] = []  # word count of each sentence in current_chunk
     current_len = 0
 
     for sentence in sentences:
@@ -103,15 +127,17 @@ def chunk_text(text: str, chunk_size: int = 512, overlap: int = 64) -> List[str]
             # Keep overlap
             overlap_words = 0
             overlap_start = len(current_chunk)
-            for j in range(len(current_chunk) - 1, -1, -1):
-                overlap_words += len(current_chunk[j].split())
+            for j in range(len(current_counts) - 1, -1, -1):
+                overlap_words += current_counts[j]
                 if overlap_words >= overlap:
                     overlap_start = j
                     break
             current_chunk = current_chunk[overlap_start:]
-            current_len = sum(len(s.split()) for s in current_chunk)
+            current_counts = current_counts[overlap_start:]
+            current_len = sum(current_counts)
 
         current_chunk.append(sentence)
+        current_counts.append(words)
         current_len += words
 
     if current_chunk:
@@ -122,27 +148,35 @@ def chunk_text(text: str, chunk_size: int = 512, overlap: int = 64) -> List[str]
 
 # ─────────────── Embedding via Groq (using LLM as proxy) ───────────────
 
+_EMBED_DIM = 128  # one dimension per bit of an MD5 digest
+
+
+@lru_cache(maxsize=65536)
+def _word_signs(word: str) -> np.ndarray:
+    """±1 vector from the bits of md5(word), bit d of the digest → dim d."""
+    digest = hashlib.md5(word.encode()).digest()
+    # int(hexdigest, 16) is big-endian, so reverse bytes to read bit 0 first
+    bits = np.unpackbits(np.frombuffer(digest[::-1], dtype=np.uint8), bitorder="little")
+    return bits.astype(np.float64) * 2.0 - 1.0
+
+
 async def _get_embeddings_via_groq(texts: List[str]) -> List[List[float]]:
     """
     Generate lightweight hash-based embeddings.
     For production, swap with a real embedding model (e.g. sentence-transformers).
     This uses a deterministic hash to create pseudo-embeddings that enable similarity search.
     """
-    import hashlib
     embeddings = []
-    dim = 128
     for text in texts:
         # Create a deterministic pseudo-embedding from text n-grams
         words = text.lower().split()
-        vec = [0.0] * dim
-        for i, word in enumerate(words):
-            h = int(hashlib.md5(word.encode()).hexdigest(), 16)
-            for d in range(dim):
-                vec[d] += ((h >> d) & 1) * 2 - 1  # Map to -1/+1
+        if words:
+            vec = np.sum([_word_signs(w) for w in words], axis=0)
+        else:
+            vec = np.zeros(_EMBED_DIM)
         # Normalize
-        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
-        vec = [v / norm for v in vec]
-        embeddings.append(vec)
+        norm = np.linalg.norm(vec) or 1.0
+        embeddings.append((vec / norm).tolist())
     return embeddings
 
 
@@ -156,6 +190,7 @@ class RAGEngine:
 
     def __init__(self):
         self.store = SimpleVectorStore()
+        self._client: Optional[httpx.AsyncClient] = None
 
     async def ingest_text(self, text: str, source: str = "unknown", chunk_size: int = 512) -> int:
         """Ingest raw text: chunk → embed → store. Returns number of chunks added."""
@@ -174,9 +209,34 @@ class RAGEngine:
         query_emb = await _get_embeddings_via_groq([query])
         return self.store.search(query_emb[0], top_k=top_k)
 
-    async def query(self, question: str, top_k: int = 5, system_context: str = "") -> str:
-        """Full RAG: search for context → generate answer with LLM."""
-        results = await self.search(question, top_k=top_k)
+    def _http(self) -> httpx.AsyncClient:
+        """Shared client, so repeated queries reuse the Groq TCP/TLS connection."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def query(
+        self,
+        question: str,
+        top_k: int = 5,
+        system_context: str = "",
+        results: Optional[List[Dict[str, Any]]] = None,
+    ) -> str:
+        """
+        Full RAG: search for context → generate answer with LLM.
+        Pass results from an earlier search() to skip searching again.
+        """
+        if results is None:
+            results = await self.search(question, top_k=top_k)
         context_text = "\n---\n".join(r["document"] for r in results)
 
         system = (
@@ -185,26 +245,18 @@ class RAGEngine:
             f"{system_context}\n\n"
             f"=== RETRIEVED CONTEXT ===\n{context_text}\n=== END CONTEXT ==="
         )
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {GROQ_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": GROQ_MODEL,
-                    "messages": [
-                        {"role": "system", "content": system},
-                        {"role": "user", "content": question},
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 1024,
-                },
-            )
-            resp.raise_for_status()
-            return resp.json()["choices"][0]["message"]["content"]
+        payload = {
+            "model": GROQ_MODEL,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": question},
+            ],
+            "temperature": 0.3,
+            "max_tokens": 1024,
+        }
+        resp = await self._http().post(GROQ_CHAT_URL, headers=_groq_headers(), json=payload)
+        resp.raise_for_status()
+        return resp.json()["choices"][0]["message"]["content"]
 
     @property
     def document_count(self) -> int:
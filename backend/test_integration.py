@@ -9,75 +9,104 @@ EVALUATOR_URL = "http://localhost:8010"
 ORCHESTRATOR_URL = "http://localhost:8011"
 TEST_USER_ID = "44444444-4444-4444-4444-444444444444"
 
-async def run_test():
+def make_client() -> httpx.AsyncClient:
+    """One pooled client for the whole run (keep-alive to both services)."""
+    return httpx.AsyncClient(
+        timeout=30,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30),
+    )
+
+async def run_test(client: httpx.AsyncClient):
     print("=" * 60)
     print("🧪 StudyMate Integration Test")
     print("=" * 60)
     
-    async with httpx.AsyncClient(timeout=30) as client:
-        # Test 1: Health checks
-        print("\n📋 Step 1: Health Checks")
-        
-        try:
-            r1 = await client.get(f"{EVALUATOR_URL}/health")
-            print(f"  Evaluator:    {r1.json()}")
-        except Exception as e:
-            print(f"  Evaluator:    ❌ FAILED - {e}")
-            return
-        
-        try:
-            r2 = await client.get(f"{ORCHESTRATOR_URL}/health")
-            print(f"  Orchestrator: {r2.json()}")
-        except Exception as e:
-            print(f"  Orchestrator: ❌ FAILED - {e}")
-            return
-        
-        # Test 2: Call Evaluator
-        print("\n📋 Step 2: POST /evaluate")
-        payload = {
-            "user_id": TEST_USER_ID,
-            "module": "test",
-            "question": "What is a hash table?",
-            "answer": "A data structure using key-value pairs with O(1) lookup"
-        }
-        print(f"  Payload: {payload}")
-        
-        try:
-            r3 = await client.post(f"{EVALUATOR_URL}/evaluate", json=payload)
-            print(f"  Response: {r3.json()}")
-            if r3.json().get("status") == "ok":
-                print("  ✅ Evaluator returned OK")
-            else:
-                print("  ⚠️ Unexpected response")
-        except Exception as e:
-            print(f"  ❌ FAILED - {e}")
-            return
-        
-        # Test 3: Call Orchestrator
-        print("\n📋 Step 3: GET /next")
-        try:
-            r4 = await client.get(f"{ORCHESTRATOR_URL}/next", params={"user_id": TEST_USER_ID})
-            result = r4.json()
-            print(f"  Response: {result}")
-            print(f"  next_module: {result.get('next_module')}")
-            print(f"  reason:      {result.get('reason')}")
-            print("  ✅ Orchestrator returned routing decision")
-        except Exception as e:
-            print(f"  ❌ FAILED - {e}")
-            return
-        
-        # Test 4: Check user state
-        print("\n📋 Step 4: GET /state (debug)")
-        try:
-            r5 = await client.get(f"{ORCHESTRATOR_URL}/state/{TEST_USER_ID}")
-            print(f"  User State: {r5.json()}")
-            print("  ✅ State retrieved")
-        except Exception as e:
-            print(f"  ❌ FAILED - {e}")
-        
-        print("\n" + "=" * 60)
-        print("✅ INTEGRATION TEST COMPLETE")
-        print("=" * 60)
+    # Test 1: Health checks (independent — probe both at once)
+    print("\n📋 Step 1: Health Checks")
+    
+    r1, r2 = await asyncio.gather(
+        client.get(f"{EVALUATOR_URL}/health"),
+        client.get(f"{ORCHESTRATOR_URL}/health"),
+        return_exceptions=True,
+    )
+    try:
+        if isinstance(r1, Exception):
+            raise r1
+        print(f"  Evaluator:    {r1.json()}")
+    except Exception as e:
+        print(f"  Evaluator:    ❌ FAILED - {e}")
+        return
+    
+    try:
+        if isinstance(r2, Exception):
+            raise r2
+        print(f"  Orchestrator: {r2.json()}")
+    except Exception as e:
+        print(f"  Orchestrator: ❌ FAILED - {e}")
+        return
+    
+    # Test 2: Call Evaluator
+    print("\n📋 Step 2: POST /evaluate")
+    payload = {
+        "user_id": TEST_USER_ID,
+        "module": "test",
+        "question": "What is a hash table?",
+        "answer": "A data structure using key-value pairs with O(1) lookup"
+    }
+    print(f"  Payload: {payload}")
+    
+    try:
+        r3 = await client.post(f"{EVALUATOR_URL}/evaluate", json=payload)
+        print(f"  Response: {r3.json()}")
+        if r3.json().get("status") == "ok":
+            print("  ✅ Evaluator returned OK")
+        else:
+            print("  ⚠️ Unexpected response")
+    except Exception as e:
+        print(f"  ❌ FAILED - {e}")
+        return
+    
+    # Steps 3 and 4 both only depend on step 2: issue them together
+    r4, r5 = await asyncio.gather(
+        client.get(f"{ORCHESTRATOR_URL}/next", params={"user_id": TEST_USER_ID}),
+        client.get(f"{ORCHESTRATOR_URL}/state/{TEST_USER_ID}"),
+        return_exceptions=True,
+    )
+    
+    # Test 3: Call Orchestrator
+    print("\n📋 Step 3: GET /next")
+    try:
+        if isinstance(r4, Exception):
+            raise r4
+        result = r4.json()
+        print(f"  Response: {result}")
+        print(f"  next_module: {result.get('next_module')}")
+        print(f"  reason:      {result.get('reason')}")
+        print("  ✅ Orchestrator returned routing decision")
+    except Exception as e:
+        print(f"  ❌ FAILED - {e}")
+        return
+    
+    # Test 4: Check user state
+    print("\n📋 Step 4: GET /state (debug)")
+    try:
+        if isinstance(r5, Exception):
+            raise r5
+        print(f"  User State: {r5.json()}")
+        print("  ✅ State retrieved")
+    except Exception as e:
+        print(f"  ❌ FAILED - {e}")
+    
+    print("\n" + "=" * 60)
+    print("✅ INTEGRATION TEST COMPLETE")
+    print("=" * 60)
+
+async def main():
+    client = make_client()
+    try:
+        await run_test(client)
+    finally:
+        await client.aclose()
 
 if __name__ == "__main__":
-    asyncio.run(run_test())
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+BatchWriter Tests
+=================
+Checks shutdown and error handling of shared.batch_writer.BatchWriter
+against an in-memory fake pool (no database needed).
+Run: python backend/tests/test_batch_writer.py  (or via pytest)
+"""
+
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+# Make `shared` importable from backend root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.batch_writer import BatchWriter
+
+
+class FakeConn:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def execute(self, sql, *columns):
+        self.pool.calls += 1
+        if self.pool.gate is not None:
+            self.pool.in_flight.set()
+            await self.pool.gate.wait()
+        if self.pool.fail_next:
+            self.pool.fail_next -= 1
+            raise RuntimeError("connection reset")
+        self.pool.rows.extend(zip(*columns))
+
+
+class FakePool:
+    """Records the rows of each INSERT; can block or fail executes."""
+
+    def __init__(self, gate=None, fail_next=0):
+        self.rows = []
+        self.calls = 0
+        self.gate = gate
+        self.in_flight = asyncio.Event()
+        self.fail_next = fail_next
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConn(self)
+
+
+class RecordingWriter(BatchWriter):
+    insert_sql = "INSERT INTO t SELECT * FROM unnest($1::int[], $2::text[])"
+    name = "test"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failed = []
+        self.flushed = []
+
+    def _on_flush_error(self, batch, error):
+        self.failed.append(list(batch))
+
+    def _on_flushed(self, batch):
+        self.flushed.append(list(batch))
+
+
+def test_stop_finishes_in_flight_batch_and_drains_queue():
+    async def run():
+        gate = asyncio.Event()
+        pool = FakePool(gate=gate)
+        writer = RecordingWriter(pool, flush_interval_s=60, max_batch=2)
+        await writer.start()
+
+        # Fill one batch so the loop starts an INSERT, then hold it open
+        writer.submit_many([(1, "a"), (2, "b")])
+        await asyncio.wait_for(pool.in_flight.wait(), 1)
+
+        # More rows arrive while the INSERT is running, then shutdown starts
+        writer.submit_many([(3, "c"), (4, "d"), (5, "e")])
+        stop = asyncio.create_task(writer.stop())
+        await asyncio.sleep(0)
+        assert not stop.done()
+
+        gate.set()
+        await asyncio.wait_for(stop, 1)
+        return pool, writer
+
+    pool, writer = asyncio.run(run())
+    assert sorted(pool.rows) == [(1, "a"), (2, "b"), (3, "c"), (4, "d"), (5, "e")]
+    assert writer.failed == []
+    assert writer._queue.empty()
+
+
+def test_failing_flush_does_not_kill_the_loop():
+    async def run():
+        pool = FakePool(fail_next=1)
+        writer = RecordingWriter(pool, flush_interval_s=0.01, max_batch=10)
+        await writer.start()
+
+        writer.submit((1, "lost"))
+        for _ in range(100):
+            if writer.failed:
+                break
+            await asyncio.sleep(0.01)
+
+        # The loop must still be alive and flushing later batches
+        writer.submit((2, "kept"))
+        for _ in range(100):
+            if writer.flushed:
+                break
+            await asyncio.sleep(0.01)
+        alive = not writer._task.done()
+        await writer.stop()
+        return pool, writer, alive
+
+    pool, writer, alive = asyncio.run(run())
+    assert writer.failed == [[(1, "lost")]]
+    assert writer.flushed == [[(2, "kept")]]
+    assert pool.rows == [(2, "kept")]
+    assert alive
+
+
+if __name__ == "__main__":
+    for test in (
+        test_stop_finishes_in_flight_batch_and_drains_queue,
+        test_failing_flush_does_not_kill_the_loop,
+    ):
+        test()
+        print(f"✅ {test.__name__}")
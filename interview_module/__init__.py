@@ -33,93 +33,81 @@ Quick Start:
 
 __version__ = "2.1.0"
 
-try:
-    # ── Core classes ─────────────────────────────────────────────────
-    from .feature_engineering import FeatureExtractor
-    from .face_mesh_module import FaceMeshProcessor, LandmarkFrame
+import importlib
 
+# Public names are loaded on first access (PEP 562) so that importing the
+# package — e.g. just for InterviewResult or StressEstimator — doesn't pull
+# in cv2/MediaPipe and the model files until a processor is actually used.
+_LAZY = {
+    # ── Core classes ─────────────────────────────────────────────────
+    "FeatureExtractor": "feature_engineering",
+    "FaceMeshProcessor": "face_mesh_module",
+    "LandmarkFrame": "face_mesh_module",
     # ── Hand & Posture ───────────────────────────────────────────────
-    from .hand_posture_module import (
-        BodyProcessor,
-        HandProcessor,
-        PoseProcessor,
-        BodyFrame,
-        HandLandmarkFrame,
-        PoseLandmarkFrame,
-    )
-    from .body_language_features import BodyLanguageExtractor
-
+    "BodyProcessor": "hand_posture_module",
+    "HandProcessor": "hand_posture_module",
+    "PoseProcessor": "hand_posture_module",
+    "BodyFrame": "hand_posture_module",
+    "HandLandmarkFrame": "hand_posture_module",
+    "PoseLandmarkFrame": "hand_posture_module",
+    "BodyLanguageExtractor": "body_language_features",
     # ── Stress model ─────────────────────────────────────────────────
-    from .stress_model import (
-        StressEstimator,
-        StressScore,
-        DeceptionFlags,
-        InterviewSession,
-        QuestionAnalysis,
-        QuestionContext,
-        UserProfile,
-        STUDYMATE_METRICS,
-    )
-
+    "StressEstimator": "stress_model",
+    "StressScore": "stress_model",
+    "DeceptionFlags": "stress_model",
+    "InterviewSession": "stress_model",
+    "QuestionAnalysis": "stress_model",
+    "QuestionContext": "stress_model",
+    "UserProfile": "stress_model",
+    "STUDYMATE_METRICS": "stress_model",
     # ── Feedback & integration ───────────────────────────────────────
-    from .feedback_engine import (
-        FeedbackEngine,
-        QuickFeedback,
-        DetailedFeedback,
-        ProgressFeedback,
-        QuestionFeedback,
-    )
-    from .studymate_bridge import (
-        StudyMateBridge,
-        InterviewResult,
-        OrchestratorRecommendation,
-    )
-except ImportError:
-    from feature_engineering import FeatureExtractor
-    from face_mesh_module import FaceMeshProcessor, LandmarkFrame
+    "FeedbackEngine": "feedback_engine",
+    "QuickFeedback": "feedback_engine",
+    "DetailedFeedback": "feedback_engine",
+    "ProgressFeedback": "feedback_engine",
+    "QuestionFeedback": "feedback_engine",
+    "StudyMateBridge": "studymate_bridge",
+    "InterviewResult": "studymate_bridge",
+    "OrchestratorRecommendation": "studymate_bridge",
+}
+
+# Hand/pose tracking is optional: these resolve to None if unavailable
+_OPTIONAL = frozenset({
+    "BodyProcessor",
+    "HandProcessor",
+    "PoseProcessor",
+    "BodyFrame",
+    "HandLandmarkFrame",
+    "PoseLandmarkFrame",
+    "BodyLanguageExtractor",
+})
 
+
+def _import_submodule(module_name: str):
     try:
-        from hand_posture_module import (
-            BodyProcessor,
-            HandProcessor,
-            PoseProcessor,
-            BodyFrame,
-            HandLandmarkFrame,
-            PoseLandmarkFrame,
-        )
-        from body_language_features import BodyLanguageExtractor
+        return importlib.import_module(f".{module_name}", __name__)
     except ImportError:
-        BodyProcessor = None  # type: ignore
-        HandProcessor = None  # type: ignore
-        PoseProcessor = None  # type: ignore
-        BodyFrame = None  # type: ignore
-        HandLandmarkFrame = None  # type: ignore
-        PoseLandmarkFrame = None  # type: ignore
-        BodyLanguageExtractor = None  # type: ignore
-
-    from stress_model import (
-        StressEstimator,
-        StressScore,
-        DeceptionFlags,
-        InterviewSession,
-        QuestionAnalysis,
-        QuestionContext,
-        UserProfile,
-        STUDYMATE_METRICS,
-    )
+        # Loaded with interview_module/ itself on sys.path
+        return importlib.import_module(module_name)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(_import_submodule(module_name), name)
+    except ImportError:
+        if name not in _OPTIONAL:
+            raise
+        value = None
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY})
 
-    from feedback_engine import (
-        FeedbackEngine,
-        QuickFeedback,
-        DetailedFeedback,
-        ProgressFeedback,
-        QuestionFeedback,
-    )
-    from studymate_bridge import (
-        StudyMateBridge,
-        InterviewResult,
-        OrchestratorRecommendation,
-    )
 
 __all__ = [
     # Core
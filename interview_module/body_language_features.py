@@ -24,15 +24,17 @@ Author: StudyMate Platform
 
 from __future__ import annotations
 
-from collections import deque
+import math
 from typing import Any, Dict, Optional
 
 import numpy as np
 
 try:
     from .hand_posture_module import BodyFrame, HandLandmarkFrame, PoseLandmarkFrame
+    from .signal_utils import Smoother, clip
 except ImportError:
     from hand_posture_module import BodyFrame, HandLandmarkFrame, PoseLandmarkFrame
+    from signal_utils import Smoother, clip
 
 
 # ── MediaPipe landmark indices (Pose model, 33 landmarks) ───────────
@@ -61,18 +63,29 @@ _MIDDLE_MCP = 9
 _RING_MCP = 13
 _PINKY_MCP = 17
 
+# Palm-center and finger-tip landmark groups
+_PALM_IDX = (_WRIST, _INDEX_MCP, _MIDDLE_MCP, _RING_MCP, _PINKY_MCP)
+_TIP_IDX = (_THUMB_TIP, _INDEX_TIP, _MIDDLE_TIP, _RING_TIP, _PINKY_TIP)
+
 # Smoothing history length (frames)
 _HISTORY = 15
 
+# Minimum pose landmark visibility to trust a measurement
+_MIN_VISIBILITY = 0.3
+
+
+# The per-frame math below works on single landmarks and scalars, where a
+# NumPy call costs far more in dispatch than the arithmetic itself; plain
+# floats and the math module are several times faster at this size.
 
 def _dist(a: np.ndarray, b: np.ndarray) -> float:
     """Euclidean distance between two landmarks (x, y, z)."""
-    return float(np.linalg.norm(a - b))
+    return math.dist(a.tolist(), b.tolist())
 
 
 def _dist_2d(a: np.ndarray, b: np.ndarray) -> float:
     """Euclidean distance using only x, y (ignore depth)."""
-    return float(np.linalg.norm(a[:2] - b[:2]))
+    return math.hypot(float(a[0] - b[0]), float(a[1] - b[1]))
 
 
 class BodyLanguageExtractor:
@@ -89,14 +102,14 @@ class BodyLanguageExtractor:
         self._prev_hand_positions: Dict[str, Optional[np.ndarray]] = {
             "Left": None, "Right": None,
         }
-        self._hand_velocity_history: deque = deque(maxlen=history_len)
-        self._hand_to_face_history: deque = deque(maxlen=history_len)
-        self._palm_openness_history: deque = deque(maxlen=history_len)
+        self._hand_velocity_history = Smoother(history_len)
+        self._hand_to_face_history = Smoother(history_len)
+        self._palm_openness_history = Smoother(history_len)
 
         # ── Pose tracking history ────────────────────────────────
-        self._posture_history: deque = deque(maxlen=history_len)
-        self._shoulder_history: deque = deque(maxlen=history_len)
-        self._body_position_history: deque = deque(maxlen=history_len)
+        self._posture_history = Smoother(history_len)
+        self._shoulder_history = Smoother(history_len)
+        self._body_position_history = Smoother(history_len)
         self._prev_body_center: Optional[np.ndarray] = None
 
     # ─────────────────────────────────────────────────────────────
@@ -139,9 +152,9 @@ class BodyLanguageExtractor:
     ) -> Dict[str, float]:
         if hand_frame is None or len(hand_frame.hands) == 0:
             # No hands detected — return benign defaults
-            self._hand_velocity_history.append(0.0)
-            self._hand_to_face_history.append(0.0)
-            self._palm_openness_history.append(0.5)
+            self._hand_velocity_history.update(0.0)
+            self._hand_to_face_history.update(0.0)
+            self._palm_openness_history.update(0.5)
             return {}
 
         fidget_velocities = []
@@ -157,7 +170,9 @@ class BodyLanguageExtractor:
             if prev is not None:
                 velocity = _dist_2d(wrist_pos, prev)
                 fidget_velocities.append(velocity)
-            self._prev_hand_positions[label] = wrist_pos.copy()
+            # No copy needed: hand arrays are rebuilt every frame by
+            # HandProcessor, so this view is never overwritten.
+            self._prev_hand_positions[label] = wrist_pos
 
             # ── 2. Hand-to-face proximity ────────────────────────
             # Use nose position approximation: face center is roughly
@@ -168,7 +183,7 @@ class BodyLanguageExtractor:
             # If wrist is above shoulders (y < 0.45) it's near face
             # The closer to nose (~0.25-0.35), the higher the score.
             if wrist_y < 0.50:
-                proximity = float(np.clip(1.0 - wrist_y / 0.50, 0.0, 1.0))
+                proximity = clip(1.0 - wrist_y / 0.50)
             else:
                 proximity = 0.0
             face_proximities.append(proximity)
@@ -178,22 +193,18 @@ class BodyLanguageExtractor:
             openness_scores.append(openness)
 
         # Aggregate across both hands
-        fidget = float(np.mean(fidget_velocities)) if fidget_velocities else 0.0
+        fidget = sum(fidget_velocities) / len(fidget_velocities) if fidget_velocities else 0.0
         # Scale fidget: small movements < 0.01 are normal, > 0.04 is fidgety
-        fidget_score = float(np.clip(fidget / 0.04, 0.0, 1.0))
+        fidget_score = clip(fidget / 0.04)
 
-        face_prox = float(np.max(face_proximities)) if face_proximities else 0.0
-        palm_open = float(np.mean(openness_scores)) if openness_scores else 0.5
+        face_prox = max(face_proximities) if face_proximities else 0.0
+        palm_open = sum(openness_scores) / len(openness_scores) if openness_scores else 0.5
 
         # Smooth
-        self._hand_velocity_history.append(fidget_score)
-        self._hand_to_face_history.append(face_prox)
-        self._palm_openness_history.append(palm_open)
-
         return {
-            "hand_fidget_score": float(np.mean(self._hand_velocity_history)),
-            "hand_to_face": float(np.mean(self._hand_to_face_history)),
-            "palm_openness": float(np.mean(self._palm_openness_history)),
+            "hand_fidget_score": self._hand_velocity_history.update(fidget_score),
+            "hand_to_face": self._hand_to_face_history.update(face_prox),
+            "palm_openness": self._palm_openness_history.update(palm_open),
         }
 
     def _compute_palm_openness(self, hand_lms: np.ndarray) -> float:
@@ -202,19 +213,18 @@ class BodyLanguageExtractor:
         Measured by average finger-tip to palm-center distance relative
         to palm size.
         """
-        palm_center = np.mean(
-            hand_lms[[_WRIST, _INDEX_MCP, _MIDDLE_MCP, _RING_MCP, _PINKY_MCP]], axis=0
-        )
-        palm_size = _dist(hand_lms[_WRIST], hand_lms[_MIDDLE_MCP])
+        pts = hand_lms.tolist()
+        palm_size = math.dist(pts[_WRIST], pts[_MIDDLE_MCP])
         if palm_size < 1e-6:
             return 0.5
 
-        tips = [_THUMB_TIP, _INDEX_TIP, _MIDDLE_TIP, _RING_TIP, _PINKY_TIP]
-        avg_tip_dist = float(np.mean([_dist(hand_lms[t], palm_center) for t in tips]))
+        palm = [pts[i] for i in _PALM_IDX]
+        palm_center = [sum(c) / len(palm) for c in zip(*palm)]
+        avg_tip_dist = sum(math.dist(pts[t], palm_center) for t in _TIP_IDX) / len(_TIP_IDX)
 
         # Normalize by palm size.  Closed fist ≈ 0.5, open ≈ 1.5+
         ratio = avg_tip_dist / palm_size
-        openness = float(np.clip((ratio - 0.5) / 1.0, 0.0, 1.0))
+        openness = clip((ratio - 0.5) / 1.0)
         return openness
 
     # ─────────────────────────────────────────────────────────────
@@ -225,33 +235,42 @@ class BodyLanguageExtractor:
         self, pose_frame: Optional[PoseLandmarkFrame],
     ) -> Dict[str, Any]:
         if pose_frame is None:
-            self._posture_history.append(0.0)
-            self._shoulder_history.append(0.0)
-            self._body_position_history.append(0.0)
+            self._posture_history.update(0.0)
+            self._shoulder_history.update(0.0)
+            self._body_position_history.update(0.0)
             return {}
 
         lms = pose_frame.landmarks  # (33, 3)
         vis = pose_frame.visibility  # (33,)
 
-        posture = self._compute_posture_score(lms, vis)
-        shoulder = self._compute_shoulder_tension(lms, vis)
-        stillness = self._compute_body_stillness(lms)
-        head_tilt = self._compute_head_tilt(lms, vis)
-        lean_label = self._compute_lean_direction(lms, vis)
+        # Visibility checks, once per frame: the helpers share landmark
+        # groups (posture and lean both need shoulders + hips + nose).
+        ok = (vis >= _MIN_VISIBILITY).tolist()
+        shoulders_ok = ok[_LEFT_SHOULDER] and ok[_RIGHT_SHOULDER]
+        ears_ok = ok[_LEFT_EAR] and ok[_RIGHT_EAR]
+        torso_ok = shoulders_ok and ok[_LEFT_HIP] and ok[_RIGHT_HIP] and ok[_NOSE]
+
+        # Torso midpoints, shared by posture, lean and stillness
+        mid_shoulder = (lms[_LEFT_SHOULDER] + lms[_RIGHT_SHOULDER]) / 2
+        mid_hip = (lms[_LEFT_HIP] + lms[_RIGHT_HIP]) / 2
 
-        self._posture_history.append(posture)
-        self._shoulder_history.append(shoulder)
+        posture = self._compute_posture_score(lms, mid_shoulder, mid_hip, torso_ok)
+        shoulder = self._compute_shoulder_tension(lms, shoulders_ok and ears_ok)
+        stillness = self._compute_body_stillness(mid_shoulder, mid_hip)
+        head_tilt = self._compute_head_tilt(lms, ears_ok)
+        lean_label = self._compute_lean_direction(lms, mid_shoulder, mid_hip, torso_ok)
 
         return {
-            "posture_score": float(np.mean(self._posture_history)),
-            "shoulder_tension": float(np.mean(self._shoulder_history)),
+            "posture_score": self._posture_history.update(posture),
+            "shoulder_tension": self._shoulder_history.update(shoulder),
             "body_stillness": stillness,  # already smoothed internally
             "head_tilt": head_tilt,
             "lean_direction_label": lean_label,  # type: ignore[dict-item]
         }
 
     def _compute_posture_score(
-        self, lms: np.ndarray, vis: np.ndarray,
+        self, lms: np.ndarray, mid_shoulder: np.ndarray, mid_hip: np.ndarray,
+        visible: bool,
     ) -> float:
         """0 = upright, 1 = severely slouched.
         
@@ -259,13 +278,9 @@ class BodyLanguageExtractor:
         relative to hips.  Good posture: shoulders directly above hips.
         Slouching: shoulders move forward (larger z) or drop (larger y).
         """
-        # Check visibility
-        needed = [_LEFT_SHOULDER, _RIGHT_SHOULDER, _LEFT_HIP, _RIGHT_HIP, _NOSE]
-        if any(vis[i] < 0.3 for i in needed):
+        if not visible:  # shoulders, hips and nose
             return 0.0  # not enough confidence
 
-        mid_shoulder = (lms[_LEFT_SHOULDER] + lms[_RIGHT_SHOULDER]) / 2
-        mid_hip = (lms[_LEFT_HIP] + lms[_RIGHT_HIP]) / 2
         nose = lms[_NOSE]
 
         # Vertical alignment: shoulder y should be well above hip y.
@@ -286,23 +301,21 @@ class BodyLanguageExtractor:
 
         # Slouch score combines forward lean + head drop
         # Normal: forward_lean ≈ 0, head_drop_ratio ≈ 0.5+
-        slouch = float(np.clip(
-            (1.0 - head_drop_ratio) * 0.6 + abs(forward_lean) * 8.0 * 0.4,
-            0.0, 1.0
-        ))
+        slouch = clip(
+            (1.0 - head_drop_ratio) * 0.6 + abs(forward_lean) * 8.0 * 0.4
+        )
 
         return slouch
 
     def _compute_shoulder_tension(
-        self, lms: np.ndarray, vis: np.ndarray,
+        self, lms: np.ndarray, visible: bool,
     ) -> float:
         """0 = relaxed, 1 = tense/raised shoulders.
         
         Tension signal: shoulders raised toward ears, or asymmetric
         shoulder height.
         """
-        needed = [_LEFT_SHOULDER, _RIGHT_SHOULDER, _LEFT_EAR, _RIGHT_EAR]
-        if any(vis[i] < 0.3 for i in needed):
+        if not visible:  # shoulders and ears
             return 0.0
 
         # Shoulder-to-ear distance (normalized).  Tense → shoulders rise
@@ -312,61 +325,56 @@ class BodyLanguageExtractor:
         avg_ear_shoulder = (left_ear_shoulder + right_ear_shoulder) / 2
 
         # Normal ≈ 0.12-0.18, tense ≈ 0.06-0.10
-        tension_from_height = float(np.clip(
-            1.0 - (avg_ear_shoulder - 0.06) / 0.12, 0.0, 1.0
-        ))
+        tension_from_height = clip(1.0 - (avg_ear_shoulder - 0.06) / 0.12)
 
         # Asymmetry: different shoulder heights = uneven tension
         shoulder_height_diff = abs(lms[_LEFT_SHOULDER][1] - lms[_RIGHT_SHOULDER][1])
-        asymmetry = float(np.clip(shoulder_height_diff / 0.05, 0.0, 1.0))
+        asymmetry = clip(shoulder_height_diff / 0.05)
 
         return tension_from_height * 0.7 + asymmetry * 0.3
 
-    def _compute_body_stillness(self, lms: np.ndarray) -> float:
+    def _compute_body_stillness(
+        self, mid_shoulder: np.ndarray, mid_hip: np.ndarray,
+    ) -> float:
         """0 = still, 1 = fidgety body.
         
         Uses torso center-of-mass velocity across frames.
         """
-        mid_body = (lms[_LEFT_SHOULDER] + lms[_RIGHT_SHOULDER] +
-                     lms[_LEFT_HIP] + lms[_RIGHT_HIP]) / 4
+        mid_body = (mid_shoulder + mid_hip) / 2
 
         if self._prev_body_center is not None:
             velocity = _dist_2d(mid_body, self._prev_body_center)
         else:
             velocity = 0.0
-        self._prev_body_center = mid_body.copy()
+        self._prev_body_center = mid_body  # fresh array, safe to keep
 
         # Scale: normal typing/nodding ≈ 0.001-0.005, fidgeting > 0.01
-        fidget_score = float(np.clip(velocity / 0.015, 0.0, 1.0))
+        fidget_score = clip(velocity / 0.015)
 
-        self._body_position_history.append(fidget_score)
-        return float(np.mean(self._body_position_history))
+        return self._body_position_history.update(fidget_score)
 
     def _compute_head_tilt(
-        self, lms: np.ndarray, vis: np.ndarray,
+        self, lms: np.ndarray, visible: bool,
     ) -> float:
         """Head tilt in degrees from vertical. 0 = straight, >15 = notable."""
-        needed = [_LEFT_EAR, _RIGHT_EAR]
-        if any(vis[i] < 0.3 for i in needed):
+        if not visible:  # both ears
             return 0.0
 
         left_ear = lms[_LEFT_EAR]
         right_ear = lms[_RIGHT_EAR]
         dx = right_ear[0] - left_ear[0]
         dy = right_ear[1] - left_ear[1]
-        angle = float(np.degrees(np.arctan2(dy, dx)))
+        angle = math.degrees(math.atan2(float(dy), float(dx)))
         return abs(angle)  # degrees from horizontal (0 = level)
 
     def _compute_lean_direction(
-        self, lms: np.ndarray, vis: np.ndarray,
+        self, lms: np.ndarray, mid_shoulder: np.ndarray, mid_hip: np.ndarray,
+        visible: bool,
     ) -> str:
         """Classify body lean: center, left, right, or forward."""
-        needed = [_LEFT_SHOULDER, _RIGHT_SHOULDER, _LEFT_HIP, _RIGHT_HIP, _NOSE]
-        if any(vis[i] < 0.3 for i in needed):
+        if not visible:  # shoulders, hips and nose
             return "center"
 
-        mid_shoulder = (lms[_LEFT_SHOULDER] + lms[_RIGHT_SHOULDER]) / 2
-        mid_hip = (lms[_LEFT_HIP] + lms[_RIGHT_HIP]) / 2
         nose = lms[_NOSE]
 
         # Lateral lean: nose x vs mid_hip x
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import sys
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import Dict
 
 from stress_model import StressScore
@@ -10,8 +11,17 @@ from stress_model import StressScore
 @dataclass
 class Dashboard:
     verbose: bool = False
+    max_fps: float = 5.0  # redraws per second; frames in between are skipped
+    _last_render: float = field(init=False, default=float("-inf"))
 
     def render(self, features: Dict[str, float], stress: StressScore) -> None:
+        # The terminal can't keep up with a redraw per camera frame, and a
+        # blocked stdout stalls the capture loop — only draw every 1/max_fps.
+        now = time.monotonic()
+        if self.max_fps > 0 and now - self._last_render < 1.0 / self.max_fps:
+            return
+        self._last_render = now
+
         if self.verbose:
             sys.stdout.write("\033[2J\033[H")  # simple terminal clear
         lines = [stress.formatted()]
@@ -20,9 +30,8 @@ class Dashboard:
                 lines.append(f"{name}: {value:.3f}")
             else:
                 lines.append(f"{name}: {value}")
-        output = "\n".join(lines)
         if self.verbose:
-            print(output)
+            print("\n".join(lines))
         else:
-            sys.stdout.write("\r" + output.replace("\n", " | "))
+            sys.stdout.write("\r" + " | ".join(lines))
             sys.stdout.flush()
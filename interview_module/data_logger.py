@@ -4,7 +4,7 @@ import csv
 import pathlib
 import time
 from dataclasses import dataclass, field
-from typing import Dict, Iterable
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 
 @dataclass
@@ -12,27 +12,43 @@ class DataLogger:
     output_path: pathlib.Path
     fieldnames: Iterable[str]
     append: bool = True
-    _writer: csv.DictWriter | None = field(init=False, default=None)
+    flush_every: int = 30  # rows buffered before flushing to disk
+    flush_interval_s: float = 1.0  # ...or at most this long between flushes
+    _writer: Any = field(init=False, default=None)  # csv.writer
+    _fields: Tuple[str, ...] = field(init=False, default=())
     _file: object | None = field(init=False, default=None)
+    _pending: int = field(init=False, default=0)
+    _last_flush: float = field(init=False, default=0.0)
 
     def __post_init__(self) -> None:
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
         mode = "a" if self.append else "w"
         self._file = self.output_path.open(mode, newline="")
-        self._writer = csv.DictWriter(self._file, fieldnames=["timestamp", *self.fieldnames])
+        # Plain csv.writer over a fixed column order: no per-row dict
+        self._fields = tuple(self.fieldnames)
+        self._writer = csv.writer(self._file)
         if not self.append or self.output_path.stat().st_size == 0:
-            self._writer.writeheader()
+            self._writer.writerow(("timestamp", *self._fields))
+        self._last_flush = time.monotonic()
 
-    def log(self, metrics: Dict[str, float]) -> None:
+    def log(self, metrics: Dict[str, float], timestamp: Optional[float] = None) -> None:
         assert self._writer is not None
-        row = {name: metrics.get(name) for name in self.fieldnames}
-        row["timestamp"] = time.time()
-        self._writer.writerow(row)
-        self._file.flush()  # type: ignore[union-attr]
+        ts = time.time() if timestamp is None else timestamp
+        self._writer.writerow((ts, *map(metrics.get, self._fields)))
+        self._pending += 1
+        now = time.monotonic()
+        if self._pending >= self.flush_every or now - self._last_flush >= self.flush_interval_s:
+            self.flush()
+            self._last_flush = now
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()  # type: ignore[union-attr]
+            self._pending = 0
 
     def close(self) -> None:
         if self._file is not None:
-            self._file.close()
+            self._file.close()  # flushes any buffered rows
             self._file = None
             self._writer = None
 
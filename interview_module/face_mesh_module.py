@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import atexit
 import contextlib
 import pathlib
+import queue
+import threading
 import time
 from dataclasses import dataclass
-from typing import Generator, Iterable, Optional
+from itertools import chain
+from operator import attrgetter
+from typing import Any, Dict, Generator, Iterable, List, Optional, Set, Tuple
 
 import cv2
 import mediapipe as mp
@@ -25,6 +30,8 @@ FaceLandmarker = mp.tasks.vision.FaceLandmarker
 FaceLandmarkerOptions = mp.tasks.vision.FaceLandmarkerOptions
 VisionRunningMode = mp.tasks.vision.RunningMode
 
+_LANDMARK_XYZ = attrgetter("x", "y", "z")
+
 
 @dataclass
 class LandmarkFrame:
@@ -36,7 +43,21 @@ class LandmarkFrame:
 
 
 class FaceMeshProcessor:
-    """Wraps MediaPipe FaceLandmarker (Tasks API, ≥ 0.10)."""
+    """Wraps MediaPipe FaceLandmarker (Tasks API, ≥ 0.10).
+    
+    IMAGE and VIDEO modes are synchronous: ``process(frame)`` returns the
+    result.  In LIVE_STREAM mode, ``submit(frame)`` hands the frame to
+    MediaPipe and returns immediately; finished frames are collected with
+    ``drain()``, so the caller can read the next frame while the previous
+    one is being processed.  MediaPipe may skip frames when it falls behind.
+    At the end of a stream, ``flush()`` waits for the frames still in
+    flight and ``reset()`` discards anything left, so a late result can't
+    surface in the next stream on the same processor.
+    
+    The BGR frame is attached to ``LandmarkFrame.image`` only when
+    ``keep_image`` is set (e.g. for drawing overlays); otherwise results
+    don't keep every full frame alive downstream.
+    """
 
     def __init__(
         self,
@@ -44,7 +65,9 @@ class FaceMeshProcessor:
         min_detection_confidence: float = 0.5,
         min_tracking_confidence: float = 0.5,
         running_mode: VisionRunningMode = VisionRunningMode.IMAGE,
+        keep_image: bool = False,
     ) -> None:
+        live = running_mode == VisionRunningMode.LIVE_STREAM
         options = FaceLandmarkerOptions(
             base_options=BaseOptions(model_asset_path=str(_MODEL_PATH)),
             running_mode=running_mode,
@@ -53,14 +76,50 @@ class FaceMeshProcessor:
             min_tracking_confidence=min_tracking_confidence,
             output_face_blendshapes=False,
             output_facial_transformation_matrixes=False,
+            result_callback=self._on_result if live else None,
         )
+        # LIVE_STREAM: frames awaiting a result (ts_ms → capture time, frame)
+        # and finished frames, newest kept if the consumer falls behind.
+        # Results are only queued while _pending_lock is held, so an empty
+        # _pending means every outstanding result has been delivered.
+        self._pending: Dict[int, Tuple[float, Optional[np.ndarray]]] = {}
+        self._pending_lock = threading.Lock()
+        self._pending_done = threading.Condition(self._pending_lock)
+        self._results: "queue.Queue[LandmarkFrame]" = queue.Queue(maxsize=2)
         self._landmarker = FaceLandmarker.create_from_options(options)
         self._running_mode = running_mode
+        self._keep_image = keep_image
         self._frame_ts_ms: int = 0  # monotonic counter for VIDEO mode
+        self._rgb_buf: Optional[np.ndarray] = None  # reused BGR→RGB target
+
+    def _to_mp_image(self, image_bgr: np.ndarray) -> mp.Image:
+        # Convert into a buffer kept across frames (re-allocated only when
+        # the frame size changes); mp.Image copies the pixels it is given.
+        # Always C-contiguous — the layout mp.Image takes without another
+        # conversion — whatever the layout of the incoming frame.
+        if self._rgb_buf is None or self._rgb_buf.shape != image_bgr.shape:
+            self._rgb_buf = np.empty(image_bgr.shape, dtype=np.uint8)
+        image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        return mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
+
+    @staticmethod
+    def _to_landmark_frame(
+        result: Any, timestamp: float, image_bgr: Optional[np.ndarray],
+    ) -> Optional[LandmarkFrame]:
+        if not result.face_landmarks:
+            return None
+
+        face_lms = result.face_landmarks[0]
+        # Stream x, y, z straight into a float32 array (no list-of-lists)
+        coords = np.fromiter(
+            chain.from_iterable(map(_LANDMARK_XYZ, face_lms)),
+            dtype=np.float32,
+            count=len(face_lms) * 3,
+        ).reshape(-1, 3)
+        return LandmarkFrame(timestamp=timestamp, landmarks=coords, image=image_bgr)
 
     def process(self, image_bgr: np.ndarray) -> Optional[LandmarkFrame]:
-        image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
+        mp_image = self._to_mp_image(image_bgr)
 
         if self._running_mode == VisionRunningMode.VIDEO:
             self._frame_ts_ms += 33  # ~30 fps
@@ -68,17 +127,67 @@ class FaceMeshProcessor:
         else:
             result = self._landmarker.detect(mp_image)
 
-        if not result.face_landmarks:
-            return None
-
-        face_lms = result.face_landmarks[0]
-        coords = np.array(
-            [[lm.x, lm.y, lm.z] for lm in face_lms], dtype=np.float32
-        )
-        return LandmarkFrame(
-            timestamp=time.time(), landmarks=coords, image=image_bgr
+        return self._to_landmark_frame(
+            result, time.time(), image_bgr if self._keep_image else None
         )
 
+    def submit(self, image_bgr: np.ndarray) -> None:
+        """LIVE_STREAM mode: queue a frame for detection and return."""
+        captured_at = time.time()
+        mp_image = self._to_mp_image(image_bgr)
+        self._frame_ts_ms += 33  # ~30 fps
+        with self._pending_lock:
+            self._pending[self._frame_ts_ms] = (
+                captured_at, image_bgr if self._keep_image else None
+            )
+        self._landmarker.detect_async(mp_image, self._frame_ts_ms)
+
+    def drain(self) -> List[LandmarkFrame]:
+        """LIVE_STREAM mode: frames with a detected face since the last call."""
+        frames: List[LandmarkFrame] = []
+        while True:
+            try:
+                frames.append(self._results.get_nowait())
+            except queue.Empty:
+                return frames
+
+    def flush(self, timeout: float = 0.5) -> List[LandmarkFrame]:
+        """LIVE_STREAM mode: wait for frames still in flight, then ``drain()``.
+
+        Frames MediaPipe skipped never get a result, hence the timeout.
+        """
+        with self._pending_done:
+            self._pending_done.wait_for(lambda: not self._pending, timeout)
+        return self.drain()
+
+    def reset(self) -> None:
+        """LIVE_STREAM mode: discard in-flight and undrained results."""
+        with self._pending_lock:
+            self._pending.clear()
+            self.drain()
+
+    def _on_result(self, result: Any, output_image: mp.Image, timestamp_ms: int) -> None:
+        # Runs on MediaPipe's thread.  Frames it skipped never get a
+        # callback, so forget anything older than this one as well.
+        # A timestamp missing from _pending was discarded by reset().
+        with self._pending_lock:
+            entry = self._pending.pop(timestamp_ms, None)
+            for ts in [ts for ts in self._pending if ts < timestamp_ms]:
+                del self._pending[ts]
+            frame = (
+                self._to_landmark_frame(result, *entry) if entry is not None else None
+            )
+            while frame is not None:
+                try:
+                    self._results.put_nowait(frame)
+                    break
+                except queue.Full:
+                    # Consumer is behind: drop the oldest result, keep the newest
+                    with contextlib.suppress(queue.Empty):
+                        self._results.get_nowait()
+            if not self._pending:
+                self._pending_done.notify_all()
+
     def close(self) -> None:
         self._landmarker.close()
 
@@ -89,11 +198,64 @@ class FaceMeshProcessor:
         self.close()
 
 
+# ── Shared processors ───────────────────────────────────────────────
+# Creating a FaceLandmarker loads the model and allocates its buffers, so
+# the streaming helpers reuse one processor per configuration instead of
+# building a new one every time a stream is (re)started.  A processor is
+# leased to one stream at a time: VIDEO mode carries tracking state and
+# detect_for_video isn't thread-safe, and a LIVE_STREAM drain() would hand
+# one stream's results to another.
+_ProcessorKey = Tuple[Tuple[str, Any], ...]
+_PROCESSOR_CACHE: Dict[_ProcessorKey, "FaceMeshProcessor"] = {}
+_PROCESSORS_IN_USE: Set[_ProcessorKey] = set()
+_PROCESSOR_LOCK = threading.Lock()
+
+
+@contextlib.contextmanager
+def lease_processor(**kwargs) -> Generator[FaceMeshProcessor, None, None]:
+    """Use the shared FaceMeshProcessor for these constructor kwargs.
+
+    If another stream already holds it, this stream gets a private
+    processor instead, closed when the lease ends.
+    """
+    key = tuple(sorted(kwargs.items()))
+    with _PROCESSOR_LOCK:
+        shared = key not in _PROCESSORS_IN_USE
+        if shared:
+            processor = _PROCESSOR_CACHE.get(key)
+            if processor is None:
+                processor = FaceMeshProcessor(**kwargs)
+                _PROCESSOR_CACHE[key] = processor
+            _PROCESSORS_IN_USE.add(key)
+    if not shared:
+        processor = FaceMeshProcessor(**kwargs)
+    try:
+        yield processor
+    finally:
+        if shared:
+            with _PROCESSOR_LOCK:
+                _PROCESSORS_IN_USE.discard(key)
+        else:
+            processor.close()
+
+
+def close_all_processors() -> None:
+    """Close every shared processor (registered with atexit)."""
+    with _PROCESSOR_LOCK:
+        for processor in _PROCESSOR_CACHE.values():
+            processor.close()
+        _PROCESSOR_CACHE.clear()
+
+
+atexit.register(close_all_processors)
+
+
 def iter_landmarks_from_camera(
     camera_index: int = 0,
     width: int = 640,
     height: int = 480,
     fps: int = 30,
+    keep_image: bool = False,
 ) -> Generator[LandmarkFrame, None, None]:
     cap = cv2.VideoCapture(camera_index)
     if not cap.isOpened():
@@ -102,26 +264,36 @@ def iter_landmarks_from_camera(
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
     cap.set(cv2.CAP_PROP_FPS, fps)
 
-    with FaceMeshProcessor(running_mode=VisionRunningMode.VIDEO) as processor:
-        try:
-            while True:
-                success, frame = cap.read()
-                if not success:
-                    break
-                landmark_frame = processor.process(frame)
-                if landmark_frame is None:
-                    continue
-                yield landmark_frame
-        finally:
-            cap.release()
+    # LIVE_STREAM: detection of one frame overlaps reading the next
+    try:
+        with lease_processor(
+            running_mode=VisionRunningMode.LIVE_STREAM, keep_image=keep_image
+        ) as processor:
+            processor.reset()
+            try:
+                while True:
+                    success, frame = cap.read()
+                    if not success:
+                        break
+                    processor.submit(frame)
+                    yield from processor.drain()
+                yield from processor.flush()
+            finally:
+                # Nothing from this stream may reach the next lease
+                processor.reset()
+    finally:
+        cap.release()
 
 
 def landmark_stream_from_frames(
     frames: Iterable[np.ndarray],
     timestamp_provider: Optional[Iterable[float]] = None,
+    keep_image: bool = False,
 ) -> Generator[LandmarkFrame, None, None]:
     timestamps = iter(timestamp_provider) if timestamp_provider is not None else None
-    with FaceMeshProcessor(running_mode=VisionRunningMode.VIDEO) as processor:
+    with lease_processor(
+        running_mode=VisionRunningMode.VIDEO, keep_image=keep_image
+    ) as processor:
         for frame in frames:
             ts = next(timestamps, time.time()) if timestamps is not None else time.time()
             landmark_frame = processor.process(frame)
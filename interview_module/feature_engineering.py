@@ -19,6 +19,7 @@ Author: StudyMate Platform
 
 from __future__ import annotations
 
+import math
 import time
 from collections import deque
 from dataclasses import dataclass, field
@@ -27,6 +28,7 @@ from typing import Any, Deque, Dict, List, Optional, Tuple
 import numpy as np
 
 from face_mesh_module import LandmarkFrame
+from signal_utils import Smoother, clip
 
 # ── MediaPipe Face Mesh Landmark Indices ─────────────────────────────
 # Eyes
@@ -64,13 +66,61 @@ LEFT_EAR = 234
 RIGHT_EAR = 454
 
 
-def _distance(a: np.ndarray, b: np.ndarray) -> float:
-    return float(np.linalg.norm(a - b))
-
-
-def _average_points(indices: List[int], landmarks: np.ndarray) -> np.ndarray:
-    points = np.array([landmarks[idx] for idx in indices], dtype=np.float32)
-    return points.mean(axis=0)
+# Every landmark the extractors read, gathered once per frame
+_FACE_IDX = np.array(
+    sorted({
+        NOSE_TIP, CHIN, FOREHEAD, LEFT_CHEEK, RIGHT_CHEEK, JAW_LEFT, JAW_RIGHT,
+        LEFT_LIP_CORNER, RIGHT_LIP_CORNER, TOP_LIP, BOTTOM_LIP,
+        *LEFT_EYEBROW, *RIGHT_EYEBROW, *LEFT_EYE_LIDS, *RIGHT_EYE_LIDS,
+        *LEFT_EYE_HORIZONTAL, *RIGHT_EYE_HORIZONTAL,
+    }),
+    dtype=np.intp,
+)
+_FACE_IRIS_IDX = np.append(_FACE_IDX, [LEFT_IRIS_CENTER, RIGHT_IRIS_CENTER])
+
+# Gathered landmarks: {landmark index: [x, y, z]}
+Points = Dict[int, List[float]]
+
+
+def _gather_points(landmarks: np.ndarray, with_iris: bool) -> Points:
+    """One fancy-index gather + tolist() of the landmarks used per frame."""
+    idx = _FACE_IRIS_IDX if with_iris else _FACE_IDX
+    return dict(zip(idx.tolist(), landmarks[idx].tolist()))
+
+
+# Every distance the extractors read, as name -> (landmark a, landmark b).
+# Several metrics share the same spans (mouth height feeds lip tension, jaw
+# clench and mouth openness; eye spans feed blink, eye contact and gaze), so
+# each one is measured once per frame in _frame_distances().
+_DISTANCE_PAIRS: Dict[str, Tuple[int, int]] = {
+    "mouth_width": (LEFT_LIP_CORNER, RIGHT_LIP_CORNER),
+    "mouth_height": (TOP_LIP, BOTTOM_LIP),
+    "left_cheek_nose": (LEFT_CHEEK, NOSE_TIP),
+    "right_cheek_nose": (RIGHT_CHEEK, NOSE_TIP),
+    "face_width": (LEFT_CHEEK, RIGHT_CHEEK),
+    "face_height": (FOREHEAD, CHIN),
+    "jaw_width": (JAW_LEFT, JAW_RIGHT),
+    "left_eye_width": LEFT_EYE_HORIZONTAL,
+    "right_eye_width": RIGHT_EYE_HORIZONTAL,
+    "left_eye_height": LEFT_EYE_LIDS,
+    "right_eye_height": RIGHT_EYE_LIDS,
+}
+_IRIS_DISTANCE_PAIRS: Dict[str, Tuple[int, int]] = {
+    **_DISTANCE_PAIRS,
+    "left_iris_inner": (LEFT_EYE_HORIZONTAL[0], LEFT_IRIS_CENTER),
+    "right_iris_inner": (RIGHT_EYE_HORIZONTAL[0], RIGHT_IRIS_CENTER),
+    "left_iris_upper": (LEFT_EYE_LIDS[0], LEFT_IRIS_CENTER),
+    "right_iris_upper": (RIGHT_EYE_LIDS[0], RIGHT_IRIS_CENTER),
+}
+
+
+def _frame_distances(pts: Points, with_iris: bool) -> Dict[str, float]:
+    pairs = _IRIS_DISTANCE_PAIRS if with_iris else _DISTANCE_PAIRS
+    return {name: math.dist(pts[a], pts[b]) for name, (a, b) in pairs.items()}
+
+
+def _average_points(indices: Tuple[int, ...], pts: Points) -> List[float]:
+    return [sum(axis) / len(indices) for axis in zip(*(pts[idx] for idx in indices))]
 
 
 @dataclass
@@ -137,14 +187,15 @@ class FeatureExtractor:
         self.previous_blink_state = False
 
         # ── Smoothing histories ──────────────────────────────────
-        self.metrics_history: Dict[str, Deque[float]] = {
-            "eyebrow": deque(maxlen=smoothing_window),
-            "lip_tension": deque(maxlen=smoothing_window),
-            "nod": deque(maxlen=smoothing_window),
-            "symmetry": deque(maxlen=smoothing_window),
-            "jaw_clench": deque(maxlen=smoothing_window),
-            "head_stability": deque(maxlen=smoothing_window),
-            "mouth_openness": deque(maxlen=smoothing_window),
+        self.metrics_history: Dict[str, Smoother] = {
+            "eyebrow": Smoother(smoothing_window),
+            "lip_tension": Smoother(smoothing_window),
+            "nod": Smoother(smoothing_window),
+            "symmetry": Smoother(smoothing_window),
+            "jaw_clench": Smoother(smoothing_window),
+            "head_stability": Smoother(smoothing_window),
+            "mouth_openness": Smoother(smoothing_window),
+            "eye_contact": Smoother(smoothing_window),
         }
         self.blink_events = TemporalMetric(window_seconds=blink_window_seconds)
         self.previous_nose_height: float | None = None
@@ -152,6 +203,7 @@ class FeatureExtractor:
         # ── Stress recovery tracking ────────────────────────────
         self._stress_history: Deque[Tuple[float, float]] = deque(maxlen=300)  # (timestamp, score)
         self._last_spike_time: Optional[float] = None
+        self._spike_peak = 0.0  # highest score within 1s of the last spike
         self._recovery_rates: Deque[float] = deque(maxlen=20)  # rates from recent recoveries
 
         # ── Micro-expression detection ──────────────────────────
@@ -163,88 +215,77 @@ class FeatureExtractor:
         self._micro_expression_log: List[MicroExpressionEvent] = []
 
         # ── Head tracking for stability ─────────────────────────
-        self._head_positions: Deque[np.ndarray] = deque(maxlen=30)  # last 1 second @ 30fps
+        self._head_positions: Deque[List[float]] = deque(maxlen=30)  # last 1 second @ 30fps
+        # Per-axis running sum / sum of squares over _head_positions
+        self._head_sum = [0.0, 0.0, 0.0]
+        self._head_sqsum = [0.0, 0.0, 0.0]
+
+        # ── Iris landmarks (468+) — fixed per session, probed on first frame
+        self._has_iris: Optional[bool] = None
 
         # ── Engagement tracking ─────────────────────────────────
         self._gaze_on_camera_frames = 0
         self._total_gaze_frames = 0
 
-        # ── Eye contact via iris ────────────────────────────────
-        self._eye_contact_history: Deque[float] = deque(maxlen=smoothing_window)
-
     # ── Core Feature Extractors ──────────────────────────────────────
 
-    def _eye_aspect_ratio(
-        self,
-        landmarks: np.ndarray,
-        lids: tuple[int, int],
-        horizontal_pair: tuple[int, int],
-    ) -> float:
-        upper = landmarks[lids[0]]
-        lower = landmarks[lids[1]]
-        horizontal = _distance(landmarks[horizontal_pair[0]], landmarks[horizontal_pair[1]])
-        return _distance(upper, lower) / max(horizontal, 1e-5)
-
-    def _compute_blink_rate(self, frame: LandmarkFrame) -> float:
+    def _eye_aspect_ratio(self, eye_height: float, eye_width: float) -> float:
+        return eye_height / max(eye_width, 1e-5)
+
+    def _compute_blink_rate(
+        self, dist: Dict[str, float], timestamp: float,
+    ) -> Tuple[float, float]:
+        """Returns (blinks per minute, mean eye aspect ratio of this frame)."""
         left_ratio = self._eye_aspect_ratio(
-            frame.landmarks, LEFT_EYE_LIDS, LEFT_EYE_HORIZONTAL,
+            dist["left_eye_height"], dist["left_eye_width"],
         )
         right_ratio = self._eye_aspect_ratio(
-            frame.landmarks, RIGHT_EYE_LIDS, RIGHT_EYE_HORIZONTAL,
+            dist["right_eye_height"], dist["right_eye_width"],
         )
         eye_ratio = (left_ratio + right_ratio) * 0.5
         is_blinking = eye_ratio < self.blink_threshold
         if is_blinking and not self.previous_blink_state:
-            self.blink_events.add(frame.timestamp)
+            self.blink_events.add(timestamp)
         self.previous_blink_state = is_blinking
         minutes = max(self.blink_events.window_seconds / 60.0, 1e-3)
-        return self.blink_events.count / minutes
-
-    def _compute_eyebrow_raise(self, landmarks: np.ndarray) -> float:
-        left_brow = _average_points(list(LEFT_EYEBROW), landmarks)
-        right_brow = _average_points(list(RIGHT_EYEBROW), landmarks)
-        anchor = (landmarks[LEFT_EYE_LIDS[0]] + landmarks[RIGHT_EYE_LIDS[0]]) * 0.5
-        left_raise = abs(left_brow[1] - anchor[1])
-        right_raise = abs(right_brow[1] - anchor[1])
+        return self.blink_events.count / minutes, eye_ratio
+
+    def _compute_eyebrow_raise(self, pts: Points) -> float:
+        left_brow = _average_points(LEFT_EYEBROW, pts)
+        right_brow = _average_points(RIGHT_EYEBROW, pts)
+        anchor_y = (pts[LEFT_EYE_LIDS[0]][1] + pts[RIGHT_EYE_LIDS[0]][1]) * 0.5
+        left_raise = abs(left_brow[1] - anchor_y)
+        right_raise = abs(right_brow[1] - anchor_y)
         value = (left_raise + right_raise) * 0.5
-        self.metrics_history["eyebrow"].append(value)
-        return float(np.mean(self.metrics_history["eyebrow"]))
-
-    def _compute_lip_tension(self, landmarks: np.ndarray) -> float:
-        mouth_width = _distance(landmarks[LEFT_LIP_CORNER], landmarks[RIGHT_LIP_CORNER])
-        mouth_height = _distance(landmarks[TOP_LIP], landmarks[BOTTOM_LIP])
-        raw_ratio = mouth_width / max(mouth_height, 1e-5)
-        tension = float(np.clip((raw_ratio - 5.0) / 55.0, 0.0, 1.0))
-        self.metrics_history["lip_tension"].append(tension)
-        return float(np.mean(self.metrics_history["lip_tension"]))
-
-    def _compute_head_nod(self, frame: LandmarkFrame) -> float:
-        nose_y = frame.landmarks[NOSE_TIP][1]
-        chin_y = frame.landmarks[CHIN][1]
+        return self.metrics_history["eyebrow"].update(value)
+
+    def _compute_lip_tension(self, dist: Dict[str, float]) -> float:
+        raw_ratio = dist["mouth_width"] / max(dist["mouth_height"], 1e-5)
+        tension = clip((raw_ratio - 5.0) / 55.0)
+        return self.metrics_history["lip_tension"].update(tension)
+
+    def _compute_head_nod(self, pts: Points) -> float:
+        nose_y = pts[NOSE_TIP][1]
+        chin_y = pts[CHIN][1]
         head_length = abs(chin_y - nose_y)
         if self.previous_nose_height is None:
             self.previous_nose_height = nose_y
             return 0.0
         delta = abs(nose_y - self.previous_nose_height) / max(head_length, 1e-5)
         self.previous_nose_height = nose_y
-        self.metrics_history["nod"].append(delta)
-        return float(np.mean(self.metrics_history["nod"]))
-
-    def _compute_symmetry(self, landmarks: np.ndarray) -> float:
-        left_cheek = landmarks[LEFT_CHEEK]
-        right_cheek = landmarks[RIGHT_CHEEK]
-        nose = landmarks[NOSE_TIP]
-        left_dist = _distance(left_cheek, nose)
-        right_dist = _distance(right_cheek, nose)
+        return self.metrics_history["nod"].update(delta)
+
+    def _compute_symmetry(self, dist: Dict[str, float]) -> float:
+        left_dist = dist["left_cheek_nose"]
+        right_dist = dist["right_cheek_nose"]
         symmetry_score = abs(left_dist - right_dist) / max(
             (left_dist + right_dist) * 0.5, 1e-5
         )
-        self.metrics_history["symmetry"].append(symmetry_score)
-        return float(np.mean(self.metrics_history["symmetry"]))
+        return self.metrics_history["symmetry"].update(symmetry_score)
 
     # ── NEW: Advanced Feature Extractors ─────────────────────────────
 
-    def _compute_jaw_clench(self, landmarks: np.ndarray) -> float:
+    def _compute_jaw_clench(self, dist: Dict[str, float]) -> float:
         """Detect jaw clenching via jaw width relative to face height.
         
         Clenching causes masseter contraction → jaw widens slightly and
@@ -253,59 +294,62 @@ class FeatureExtractor:
         
         Calibrated so relaxed jaw ≈ 0.1–0.2, clenched ≈ 0.6–0.9.
         """
-        jaw_width = _distance(landmarks[JAW_LEFT], landmarks[JAW_RIGHT])
-        face_height = _distance(landmarks[FOREHEAD], landmarks[CHIN])
-        jaw_ratio = jaw_width / max(face_height, 1e-5)
+        jaw_ratio = dist["jaw_width"] / max(dist["face_height"], 1e-5)
 
         # Baseline jaw_ratio is typically 0.55-0.70 for a relaxed face.
         # Clenching pushes it to 0.75+.  Subtract baseline so relaxed ≈ 0.
-        jaw_deviation = float(np.clip((jaw_ratio - 0.65) / 0.15, 0.0, 1.0))
+        jaw_deviation = clip((jaw_ratio - 0.65) / 0.15)
 
-        mouth_height = _distance(landmarks[TOP_LIP], landmarks[BOTTOM_LIP])
-        face_width = _distance(landmarks[LEFT_CHEEK], landmarks[RIGHT_CHEEK])
         # Normalize mouth_height by face_width for scale independence
-        mouth_ratio = mouth_height / max(face_width, 1e-5)
+        mouth_ratio = dist["mouth_height"] / max(dist["face_width"], 1e-5)
         # Closed mouth ≈ 0.02, open ≈ 0.08+. Clench = low ratio.
-        mouth_compress = float(np.clip(1.0 - mouth_ratio / 0.06, 0.0, 1.0))
+        mouth_compress = clip(1.0 - mouth_ratio / 0.06)
 
         # Combine: only flag as clench when BOTH signals present
         clench = jaw_deviation * 0.5 + mouth_compress * 0.5
         # Reduce further — only significant clenching should register
-        clench = float(np.clip(clench * 0.8, 0.0, 1.0))
+        clench = clip(clench * 0.8)
 
-        self.metrics_history["jaw_clench"].append(clench)
-        return float(np.mean(self.metrics_history["jaw_clench"]))
+        return self.metrics_history["jaw_clench"].update(clench)
 
-    def _compute_mouth_openness(self, landmarks: np.ndarray) -> float:
+    def _compute_mouth_openness(self, dist: Dict[str, float]) -> float:
         """How open the mouth is — indicator of speaking vs. silent."""
-        mouth_height = _distance(landmarks[TOP_LIP], landmarks[BOTTOM_LIP])
-        mouth_width = _distance(landmarks[LEFT_LIP_CORNER], landmarks[RIGHT_LIP_CORNER])
-        openness = mouth_height / max(mouth_width, 1e-5)
-        self.metrics_history["mouth_openness"].append(openness)
-        return float(np.mean(self.metrics_history["mouth_openness"]))
+        openness = dist["mouth_height"] / max(dist["mouth_width"], 1e-5)
+        return self.metrics_history["mouth_openness"].update(openness)
 
-    def _compute_head_stability(self, frame: LandmarkFrame) -> float:
+    def _compute_head_stability(self, pts: Points) -> float:
         """Track how stable the head position is over the last ~1 second.
         
         Low jitter = stable (could be engaged OR frozen).
         High jitter = fidgety/nervous.
         Returns: jitter score 0.0 (perfectly still) to 1.0+ (very fidgety).
         """
-        nose_pos = frame.landmarks[NOSE_TIP].copy()
-        self._head_positions.append(nose_pos)
-
-        if len(self._head_positions) < 3:
+        positions = self._head_positions
+        nose = pts[NOSE_TIP]
+        evicted = positions[0] if len(positions) == positions.maxlen else (0.0, 0.0, 0.0)
+        positions.append(nose)
+        self._head_sum = [
+            s + x - e for s, x, e in zip(self._head_sum, nose, evicted)
+        ]
+        self._head_sqsum = [
+            q + x * x - e * e for q, x, e in zip(self._head_sqsum, nose, evicted)
+        ]
+
+        n = len(positions)
+        if n < 3:
             return 0.0
 
-        positions = np.array(self._head_positions)
-        # Standard deviation of positions across recent frames
-        jitter = float(np.std(positions, axis=0).mean())
+        # Standard deviation of positions across recent frames, per axis
+        # (var = E[x²] - E[x]², clamped against rounding below zero)
+        jitter = sum(
+            math.sqrt(max(q / n - (s / n) ** 2, 0.0))
+            for s, q in zip(self._head_sum, self._head_sqsum)
+        ) / 3.0
         # Normalize: typical calm jitter ≈ 0.001, nervous ≈ 0.005+
-        normalized = float(np.clip(jitter / 0.008, 0.0, 1.5))
-        self.metrics_history["head_stability"].append(normalized)
-        return float(np.mean(self.metrics_history["head_stability"]))
+        normalized = clip(jitter / 0.008, 0.0, 1.5)
+        return self.metrics_history["head_stability"].update(normalized)
 
-    def _compute_eye_contact(self, landmarks: np.ndarray) -> float:
+    def _compute_eye_contact(self, dist: Dict[str, float]) -> float:
         """Estimate eye contact using iris position relative to eye corners.
         
         When looking at camera, iris is approximately centered horizontally
@@ -313,35 +357,24 @@ class FeatureExtractor:
         Returns: 0.0 (looking away) to 1.0 (direct eye contact).
         """
         # Use iris center landmarks if available (indices 468-477)
-        if landmarks.shape[0] <= LEFT_IRIS_CENTER:
+        if not self._has_iris:
             # No iris landmarks — fall back to eye lid ratio as proxy
             return 0.5  # can't determine
 
-        left_iris = landmarks[LEFT_IRIS_CENTER]
-        right_iris = landmarks[RIGHT_IRIS_CENTER]
-        left_inner = landmarks[LEFT_EYE_HORIZONTAL[0]]
-        left_outer = landmarks[LEFT_EYE_HORIZONTAL[1]]
-        right_inner = landmarks[RIGHT_EYE_HORIZONTAL[0]]
-        right_outer = landmarks[RIGHT_EYE_HORIZONTAL[1]]
-
         # Horizontal position of iris relative to eye span (0=inner, 1=outer)
-        left_span = _distance(left_inner, left_outer)
-        left_pos = _distance(left_inner, left_iris) / max(left_span, 1e-5)
-
-        right_span = _distance(right_inner, right_outer)
-        right_pos = _distance(right_inner, right_iris) / max(right_span, 1e-5)
+        left_pos = dist["left_iris_inner"] / max(dist["left_eye_width"], 1e-5)
+        right_pos = dist["right_iris_inner"] / max(dist["right_eye_width"], 1e-5)
 
         # Center = ~0.5 for both eyes = looking at camera
         avg_deviation = (abs(left_pos - 0.5) + abs(right_pos - 0.5)) / 2.0
         # Convert deviation to contact score: 0 deviation = 1.0 contact
-        contact = float(np.clip(1.0 - avg_deviation * 3.0, 0.0, 1.0))
+        contact = clip(1.0 - avg_deviation * 3.0)
 
         self._total_gaze_frames += 1
         if contact > 0.5:
             self._gaze_on_camera_frames += 1
 
-        self._eye_contact_history.append(contact)
-        return float(np.mean(self._eye_contact_history))
+        return self.metrics_history["eye_contact"].update(contact)
 
     def _compute_engagement(
         self,
@@ -356,19 +389,19 @@ class FeatureExtractor:
         moderate expressiveness + speaking (mouth open).
         """
         # Eye contact contributes most to engagement
-        eye_score = float(np.clip(eye_contact, 0.0, 1.0))
+        eye_score = clip(eye_contact)
 
         # Head attentiveness: slight nodding is engaged (0.1-0.3),
         # still is neutral (0), excessive is distracted (0.5+)
         nod_score = 1.0 - abs(head_nod - 0.15) / 0.35
-        nod_score = float(np.clip(nod_score, 0.0, 1.0))
+        nod_score = clip(nod_score)
 
         # Expressiveness: too flat (frozen) = low, moderate = high, extreme = stress
         expr_score = 1.0 - abs(head_stability - 0.2) / 0.5
-        expr_score = float(np.clip(expr_score, 0.0, 1.0))
+        expr_score = clip(expr_score)
 
         # Mouth openness indicates speaking (active participation)
-        speaking_score = float(np.clip(mouth_openness / 0.15, 0.0, 1.0))
+        speaking_score = clip(mouth_openness / 0.15)
 
         # Weighted composite
         overall = (
@@ -382,12 +415,12 @@ class FeatureExtractor:
             eye_contact=eye_score,
             head_attentiveness=nod_score,
             facial_expressiveness=expr_score,
-            overall=float(np.clip(overall, 0.0, 1.0)),
+            overall=clip(overall),
         )
 
     # ── Gaze Direction + Psychology Labels ────────────────────────
 
-    def _compute_gaze_direction(self, landmarks: np.ndarray) -> Dict[str, Any]:
+    def _compute_gaze_direction(self, dist: Dict[str, float]) -> Dict[str, Any]:
         """Compute gaze direction (horizontal/vertical) and psychology label.
         
         Uses iris position relative to eye corners to determine where
@@ -402,7 +435,7 @@ class FeatureExtractor:
         
         Returns dict with keys: gaze_h, gaze_v, gaze_zone, gaze_label
         """
-        if landmarks.shape[0] <= LEFT_IRIS_CENTER:
+        if not self._has_iris:
             return {
                 "gaze_h": 0.0,
                 "gaze_v": 0.0,
@@ -411,37 +444,21 @@ class FeatureExtractor:
             }
 
         # ── Horizontal position (iris relative to eye span) ──
-        left_iris = landmarks[LEFT_IRIS_CENTER]
-        right_iris = landmarks[RIGHT_IRIS_CENTER]
-        left_inner = landmarks[LEFT_EYE_HORIZONTAL[0]]
-        left_outer = landmarks[LEFT_EYE_HORIZONTAL[1]]
-        right_inner = landmarks[RIGHT_EYE_HORIZONTAL[0]]
-        right_outer = landmarks[RIGHT_EYE_HORIZONTAL[1]]
-
-        left_span = _distance(left_inner, left_outer)
-        left_pos = _distance(left_inner, left_iris) / max(left_span, 1e-5)
-        right_span = _distance(right_inner, right_outer)
-        right_pos = _distance(right_inner, right_iris) / max(right_span, 1e-5)
+        left_pos = dist["left_iris_inner"] / max(dist["left_eye_width"], 1e-5)
+        right_pos = dist["right_iris_inner"] / max(dist["right_eye_width"], 1e-5)
 
         # Average horizontal position: 0.5 = center
         h_pos = (left_pos + right_pos) / 2.0
         # Normalize to -1..+1: negative = looking left, positive = looking right
-        gaze_h = float(np.clip((h_pos - 0.5) * 4.0, -1.0, 1.0))
+        gaze_h = clip((h_pos - 0.5) * 4.0, -1.0, 1.0)
 
         # ── Vertical position (iris relative to eye height) ──
-        left_upper = landmarks[LEFT_EYE_LIDS[0]]
-        left_lower = landmarks[LEFT_EYE_LIDS[1]]
-        right_upper = landmarks[RIGHT_EYE_LIDS[0]]
-        right_lower = landmarks[RIGHT_EYE_LIDS[1]]
-
-        left_eye_h = _distance(left_upper, left_lower)
-        left_iris_v = _distance(left_upper, left_iris) / max(left_eye_h, 1e-5)
-        right_eye_h = _distance(right_upper, right_lower)
-        right_iris_v = _distance(right_upper, right_iris) / max(right_eye_h, 1e-5)
+        left_iris_v = dist["left_iris_upper"] / max(dist["left_eye_height"], 1e-5)
+        right_iris_v = dist["right_iris_upper"] / max(dist["right_eye_height"], 1e-5)
 
         v_pos = (left_iris_v + right_iris_v) / 2.0
         # Normalize: negative = looking up, positive = looking down
-        gaze_v = float(np.clip((v_pos - 0.5) * 4.0, -1.0, 1.0))
+        gaze_v = clip((v_pos - 0.5) * 4.0, -1.0, 1.0)
 
         # ── Map to 9-zone grid ──
         H_THRESH = 0.25
@@ -498,9 +515,10 @@ class FeatureExtractor:
 
     def _detect_micro_expressions(
         self,
-        frame: LandmarkFrame,
+        timestamp: float,
         eyebrow: float,
         lip_tension: float,
+        avg_ear: float,
     ) -> List[MicroExpressionEvent]:
         """Detect expression flashes < 500ms — genuine micro-expressions.
         
@@ -508,7 +526,7 @@ class FeatureExtractor:
         to measure expression duration. Only logs events 40–500ms long.
         """
         detected: List[MicroExpressionEvent] = []
-        now = frame.timestamp
+        now = timestamp
 
         # Check eyebrow flash (onset > 0.04, offset < 0.03)
         detected.extend(self._track_expression_event(
@@ -523,16 +541,9 @@ class FeatureExtractor:
         ))
 
         # Eye squeeze (blink-like but partial — EAR between 0.15 and blink_threshold)
-        left_ear = self._eye_aspect_ratio(
-            frame.landmarks, LEFT_EYE_LIDS, LEFT_EYE_HORIZONTAL,
-        )
-        right_ear = self._eye_aspect_ratio(
-            frame.landmarks, RIGHT_EYE_LIDS, RIGHT_EYE_HORIZONTAL,
+        squeeze_intensity = clip(
+            (self.blink_threshold - avg_ear) / self.blink_threshold
         )
-        avg_ear = (left_ear + right_ear) * 0.5
-        squeeze_intensity = float(np.clip(
-            (self.blink_threshold - avg_ear) / self.blink_threshold, 0.0, 1.0
-        ))
         detected.extend(self._track_expression_event(
             "eye_squeeze", squeeze_intensity, onset_thresh=0.3,
             offset_thresh=0.15, now=now,
@@ -590,19 +601,27 @@ class FeatureExtractor:
             or timestamp - self._last_spike_time > 3.0  # minimum 3s between spikes
         ):
             self._last_spike_time = timestamp
+            # Seed the peak from the second leading up to the spike; later
+            # samples are folded in below as they arrive.
+            self._spike_peak = stress_score
+            for t, s in reversed(self._stress_history):
+                if timestamp - t >= 1.0:
+                    break
+                if s > self._spike_peak:
+                    self._spike_peak = s
+        elif (
+            self._last_spike_time is not None
+            and timestamp - self._last_spike_time < 1.0
+            and stress_score > self._spike_peak
+        ):
+            self._spike_peak = stress_score
 
         # Check if we're recovering from a spike
         if self._last_spike_time is not None:
             time_since_spike = timestamp - self._last_spike_time
             if 2.0 < time_since_spike < 15.0 and stress_score < 0.45:
-                # Recovered! Calculate rate
-                # Find the peak score near the spike time
-                peak = max(
-                    (s for t, s in self._stress_history
-                     if abs(t - self._last_spike_time) < 1.0),
-                    default=stress_score,
-                )
-                drop = peak - stress_score
+                # Recovered! Calculate rate from the peak near the spike
+                drop = self._spike_peak - stress_score
                 rate = drop / max(time_since_spike, 0.1)
                 self._recovery_rates.append(rate)
                 self._last_spike_time = None  # reset
@@ -648,11 +667,15 @@ class FeatureExtractor:
         """Reset all session-level tracking (call when starting a new interview)."""
         self._stress_history.clear()
         self._last_spike_time = None
+        self._spike_peak = 0.0
         self._recovery_rates.clear()
         self._micro_expression_log.clear()
         self._gaze_on_camera_frames = 0
         self._total_gaze_frames = 0
+        self._has_iris = None
         self._head_positions.clear()
+        self._head_sum = [0.0, 0.0, 0.0]
+        self._head_sqsum = [0.0, 0.0, 0.0]
         for key in self._expression_onsets:
             self._expression_onsets[key] = None
 
@@ -664,24 +687,29 @@ class FeatureExtractor:
         Returns the original 5 core features PLUS new advanced features.
         Backward-compatible — all original keys are preserved.
         """
+        if self._has_iris is None:
+            self._has_iris = frame.landmarks.shape[0] > RIGHT_IRIS_CENTER
+        pts = _gather_points(frame.landmarks, self._has_iris)
+        dist = _frame_distances(pts, self._has_iris)
+
         # ── Core features (original) ────────────────────────────
-        eyebrow = self._compute_eyebrow_raise(frame.landmarks)
-        lip_tension = self._compute_lip_tension(frame.landmarks)
-        nod = self._compute_head_nod(frame)
-        symmetry = self._compute_symmetry(frame.landmarks)
-        blink_rate = self._compute_blink_rate(frame)
+        eyebrow = self._compute_eyebrow_raise(pts)
+        lip_tension = self._compute_lip_tension(dist)
+        nod = self._compute_head_nod(pts)
+        symmetry = self._compute_symmetry(dist)
+        blink_rate, avg_ear = self._compute_blink_rate(dist, frame.timestamp)
 
         # ── Advanced features (new) ─────────────────────────────
-        jaw_clench = self._compute_jaw_clench(frame.landmarks)
-        mouth_openness = self._compute_mouth_openness(frame.landmarks)
-        head_stability = self._compute_head_stability(frame)
-        eye_contact = self._compute_eye_contact(frame.landmarks)
+        jaw_clench = self._compute_jaw_clench(dist)
+        mouth_openness = self._compute_mouth_openness(dist)
+        head_stability = self._compute_head_stability(pts)
+        eye_contact = self._compute_eye_contact(dist)
 
         # ── Gaze direction ──────────────────────────────────────
-        gaze = self._compute_gaze_direction(frame.landmarks)
+        gaze = self._compute_gaze_direction(dist)
 
         # ── Micro-expression detection ──────────────────────────
-        self._detect_micro_expressions(frame, eyebrow, lip_tension)
+        self._detect_micro_expressions(frame.timestamp, eyebrow, lip_tension, avg_ear)
 
         # ── Engagement composite ────────────────────────────────
         engagement = self._compute_engagement(
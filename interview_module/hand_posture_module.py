@@ -126,7 +126,9 @@ class HandProcessor:
         self._running_mode = running_mode
         self._frame_ts_ms: int = 0
 
-    def process(self, image_bgr: np.ndarray) -> Optional[HandLandmarkFrame]:
+    def process(
+        self, image_bgr: np.ndarray, timestamp: Optional[float] = None,
+    ) -> Optional[HandLandmarkFrame]:
         image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
 
@@ -153,7 +155,7 @@ class HandProcessor:
             handedness_labels.append(label)
 
         return HandLandmarkFrame(
-            timestamp=time.time(),
+            timestamp=time.time() if timestamp is None else timestamp,
             hands=hands,
             handedness=handedness_labels,
             image=image_bgr,
@@ -194,7 +196,9 @@ class PoseProcessor:
         self._running_mode = running_mode
         self._frame_ts_ms: int = 0
 
-    def process(self, image_bgr: np.ndarray) -> Optional[PoseLandmarkFrame]:
+    def process(
+        self, image_bgr: np.ndarray, timestamp: Optional[float] = None,
+    ) -> Optional[PoseLandmarkFrame]:
         image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
 
@@ -217,7 +221,7 @@ class PoseProcessor:
             dtype=np.float32,
         )
         return PoseLandmarkFrame(
-            timestamp=time.time(),
+            timestamp=time.time() if timestamp is None else timestamp,
             landmarks=coords,
             visibility=vis,
             image=image_bgr,
@@ -268,14 +272,16 @@ class BodyProcessor:
             )
 
     def process(self, image_bgr: np.ndarray) -> BodyFrame:
+        # One clock read per frame, shared by the hand and pose results
+        ts = time.time()
         hands = None
         pose = None
         if self._hand_processor is not None:
-            hands = self._hand_processor.process(image_bgr)
+            hands = self._hand_processor.process(image_bgr, ts)
         if self._pose_processor is not None:
-            pose = self._pose_processor.process(image_bgr)
+            pose = self._pose_processor.process(image_bgr, ts)
         return BodyFrame(
-            timestamp=time.time(),
+            timestamp=ts,
             hands=hands,
             pose=pose,
             image=image_bgr,
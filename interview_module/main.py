@@ -206,7 +206,9 @@ def run(camera_index: int, log_path: pathlib.Path, display: bool, verbose: bool)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
     cap.set(cv2.CAP_PROP_FPS, 30)
 
-    face_processor = FaceMeshProcessor(running_mode=VisionRunningMode.VIDEO)
+    face_processor = FaceMeshProcessor(
+        running_mode=VisionRunningMode.VIDEO, keep_image=display
+    )
 
     try:
         with data_logger.DataLogger(log_path, fieldnames=fields) as logger:
@@ -233,7 +235,7 @@ def run(camera_index: int, log_path: pathlib.Path, display: bool, verbose: bool)
 
                 # Terminal output (always)
                 dashboard.render(features, stress_score)
-                logger.log(metrics)
+                logger.log(metrics, face_frame.timestamp)
 
                 # OpenCV visual output
                 if display and face_frame.image is not None:
@@ -0,0 +1,43 @@
+"""
+Scalar helpers shared by the per-frame feature extractors
+(``feature_engineering.py`` and ``body_language_features.py``).
+
+Per-frame metrics are single Python floats; at that size a NumPy call
+costs far more in dispatch than the arithmetic, so these stay in plain
+Python.
+"""
+
+from __future__ import annotations
+
+
+def clip(x: float, lo: float = 0.0, hi: float = 1.0) -> float:
+    """Scalar ``np.clip`` (default range 0-1) returning a Python float."""
+    return min(max(float(x), lo), hi)
+
+
+class Smoother:
+    """Moving average over the last ``size`` samples, O(1) per update.
+
+    Equivalent to ``np.mean(deque(maxlen=size))`` (including the warm-up,
+    where it averages over the samples seen so far) but keeps a running
+    sum over a fixed ring buffer instead of rebuilding an array per frame.
+    """
+
+    __slots__ = ("_buf", "_idx", "_count", "_sum")
+
+    def __init__(self, size: int) -> None:
+        self._buf = [0.0] * size
+        self._idx = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, x: float) -> float:
+        """Add a sample and return the current average."""
+        buf = self._buf
+        i = self._idx
+        self._sum += x - buf[i]
+        buf[i] = x
+        self._idx = (i + 1) % len(buf)
+        if self._count < len(buf):
+            self._count += 1
+        return self._sum / self._count
@@ -0,0 +1,15 @@
+-- Migration: Composite indexes for UserMemory hot queries
+-- Purpose: every UserMemory read filters on user_id and orders/filters on
+-- created_at; the single-column indexes force a sort or a bitmap scan.
+
+-- get_recent_events (keyset on created_at, id), _calculate_stats (30-day window)
+CREATE INDEX IF NOT EXISTS idx_user_memory_user_created
+    ON public.user_memory(user_id, created_at DESC, id DESC);
+
+-- get_weakness_events / weakness summary
+CREATE INDEX IF NOT EXISTS idx_user_memory_weakness
+    ON public.user_memory(user_id, created_at DESC, id DESC)
+    WHERE event_type = 'weakness_detected';
+
+-- Covered by the leading column of idx_user_memory_user_created
+DROP INDEX IF EXISTS public.idx_user_memory_user_id;
@@ -0,0 +1,10 @@
+-- Migration: Sort-matching index for UserMemory.get_patterns
+-- Purpose: get_patterns orders a user's patterns by confidence, then
+-- occurrence_count; an index in that order lets Postgres read the rows
+-- pre-sorted instead of adding a Sort node.
+
+CREATE INDEX IF NOT EXISTS idx_user_patterns_sorted
+    ON public.user_patterns(user_id, confidence DESC, occurrence_count DESC);
+
+-- Covered by the leading column of idx_user_patterns_sorted
+DROP INDEX IF EXISTS public.idx_user_patterns_user_id;